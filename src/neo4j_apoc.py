@@ -0,0 +1,45 @@
+"""
+Shared apoc.periodic.iterate helpers for the OpenAlex loaders
+
+apoc.periodic.iterate commits its inner statement in batches of its own transactions and
+does not raise when some of them fail (constraint violations, deadlocks, ...): failures
+only show up in the failedBatches / errorMessages it yields. Batch queries end with
+APOC_ITERATE_RETURN and read their row through apoc_properties_set, so a failed inner
+batch surfaces as an error instead of being counted as a write.
+"""
+
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Tail of every apoc.periodic.iterate batch query
+APOC_ITERATE_RETURN = (
+    "YIELD batches, failedBatches, errorMessages, updateStatistics "
+    "RETURN batches, failedBatches, errorMessages, updateStatistics.propertiesSet AS properties_set"
+)
+
+class ApocBatchError(RuntimeError):
+    """apoc.periodic.iterate reported failed inner batches"""
+
+def has_apoc_iterate(driver, database: Optional[str] = None) -> bool:
+    """Check whether apoc.periodic.iterate is installed on the server"""
+    try:
+        with driver.session(database=database) as session:
+            result = session.run(
+                "SHOW PROCEDURES YIELD name WHERE name = 'apoc.periodic.iterate' RETURN count(*) AS found"
+            )
+            return result.single()["found"] > 0
+    except Exception as e:
+        logger.warning(f"Could not check for APOC, falling back to plain UNWIND: {e}")
+        return False
+
+def apoc_properties_set(record) -> int:
+    """Properties set by one apoc.periodic.iterate call (a row shaped by APOC_ITERATE_RETURN).
+    Raises ApocBatchError if any inner batch failed."""
+    if record["failedBatches"]:
+        raise ApocBatchError(
+            f"{record['failedBatches']} of {record['batches']} apoc.periodic.iterate batches failed: "
+            f"{record['errorMessages']}"
+        )
+    return record["properties_set"]
@@ -2,10 +2,13 @@ import logging
 import os
 import time
 from datetime import datetime, timedelta
+from email.utils import formatdate
+from pathlib import Path
 from typing import Dict, List, Optional, Iterator, Tuple
-from xml.etree import ElementTree as ET
+from urllib.parse import urlparse
 
 import requests
+from lxml import etree as ET
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from dotenv import load_dotenv
@@ -15,21 +18,50 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# OAI-PMH namespaces
+NAMESPACES = {
+    'oai': 'http://www.openarchives.org/OAI/2.0/',
+    'oai_dc': 'http://www.openarchives.org/OAI/2.0/oai_dc/',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'arxiv': 'http://arxiv.org/OAI/arXiv/'
+}
+OAI_PREFIX = '{http://www.openarchives.org/OAI/2.0/}'
+DC_PREFIX = '{http://purl.org/dc/elements/1.1/}'
+
+# Header lookups compiled once instead of resolving namespaces per record
+IDENTIFIER_XPATH = ET.XPath('oai:identifier/text()', namespaces=NAMESPACES, smart_strings=False)
+DATESTAMP_XPATH = ET.XPath('oai:datestamp/text()', namespaces=NAMESPACES, smart_strings=False)
+SET_SPEC_XPATH = ET.XPath('oai:setSpec/text()', namespaces=NAMESPACES, smart_strings=False)
+
+
+def _first(xpath: ET.XPath, elem: ET._Element) -> Optional[str]:
+    """First result of a compiled XPath lookup, or None if the element is missing."""
+    results = xpath(elem)
+    return results[0] if results else None
+
+
+def _child_texts(elem: ET._Element) -> Dict[str, Optional[str]]:
+    """Map each OAI child element's local name to its text (elements only - skips comments/PIs)."""
+    result = {}
+    for child in elem.iterchildren(ET.Element):
+        tag = child.tag
+        if tag.startswith(OAI_PREFIX):
+            tag = tag[len(OAI_PREFIX):]
+        result[tag] = child.text
+    return result
+
 
 class OAIPMHClient:
     """Client for arXiv OAI-PMH API with robust error handling and rate limiting."""
     
-    def __init__(self, base_url: str = "https://oaipmh.arxiv.org/oai"):
+    def __init__(self, base_url: str = "https://oaipmh.arxiv.org/oai", cache_dir: Optional[str] = None):
         self.base_url = base_url
         self.session = self._create_session()
+        self.namespaces = NAMESPACES
         
-        # OAI-PMH namespaces
-        self.namespaces = {
-            'oai': 'http://www.openarchives.org/OAI/2.0/',
-            'oai_dc': 'http://www.openarchives.org/OAI/2.0/oai_dc/',
-            'dc': 'http://purl.org/dc/elements/1.1/',
-            'arxiv': 'http://arxiv.org/OAI/arXiv/'
-        }
+        # On-disk cache for responses that practically never change (Identify, ListMetadataFormats)
+        self.cache_dir = Path(cache_dir or os.getenv('OAI_CACHE_DIR', '~/.cache/paperweave')).expanduser()
+        self._response_cache: Dict[str, ET._Element] = {}
     
     def _create_session(self) -> requests.Session:
         """Create a requests session with retry strategy."""
@@ -55,77 +87,99 @@ class OAIPMHClient:
         
         return session
     
-    def _make_request(self, params: Dict) -> ET.Element:
+    def _make_request(self, params: Dict) -> ET._Element:
         """Make OAI-PMH request with error handling."""
         try:
             logger.debug(f"Making OAI-PMH request: {params}")
             response = self.session.get(self.base_url, params=params, timeout=60)
             response.raise_for_status()
-            
-            # Parse XML response
-            root = ET.fromstring(response.content)
-            
-            # Check for OAI-PMH errors
-            error_elem = root.find('.//oai:error', self.namespaces)
-            if error_elem is not None:
-                error_code = error_elem.get('code', 'unknown')
-                error_text = error_elem.text or 'No error message'
-                raise Exception(f"OAI-PMH Error [{error_code}]: {error_text}")
-            
-            return root
-            
         except requests.exceptions.RequestException as e:
             logger.error(f"Request failed: {e}")
             raise
+        
+        return self._parse_response(response.content)
+    
+    def _parse_response(self, content: bytes) -> ET._Element:
+        """Parse an OAI-PMH response body and raise on OAI-PMH errors."""
+        try:
+            root = ET.fromstring(content)
         except ET.ParseError as e:
             logger.error(f"XML parsing failed: {e}")
             raise
+        
+        # Check for OAI-PMH errors
+        error_elem = root.find('.//oai:error', self.namespaces)
+        if error_elem is not None:
+            error_code = error_elem.get('code', 'unknown')
+            error_text = error_elem.text or 'No error message'
+            raise Exception(f"OAI-PMH Error [{error_code}]: {error_text}")
+        
+        return root
+    
+    def _make_cached_request(self, verb: str) -> ET._Element:
+        """
+        Make a parameterless OAI-PMH request backed by an on-disk cache.
+        
+        The cached copy is revalidated with If-Modified-Since; a 304 reuses it
+        without downloading the body again. Parsed responses are also memoized
+        for the lifetime of the client.
+        """
+        if verb in self._response_cache:
+            return self._response_cache[verb]
+        
+        cache_file = self.cache_dir / f"{urlparse(self.base_url).netloc}_{verb}.xml"
+        headers = {}
+        if cache_file.exists():
+            headers['If-Modified-Since'] = formatdate(cache_file.stat().st_mtime, usegmt=True)
+        
+        try:
+            logger.debug(f"Making cached OAI-PMH request: {verb}")
+            response = self.session.get(self.base_url, params={'verb': verb}, headers=headers, timeout=60)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request failed: {e}")
+            raise
+        
+        if response.status_code == 304:
+            logger.debug(f"{verb} not modified, using {cache_file}")
+            root = self._parse_response(cache_file.read_bytes())
+        else:
+            root = self._parse_response(response.content)
+            
+            # Atomic rewrite so a concurrent reader never sees a partial file
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_suffix('.tmp')
+                tmp_file.write_bytes(response.content)
+                os.replace(tmp_file, cache_file)
+            except OSError as e:
+                logger.warning(f"Could not write OAI-PMH cache {cache_file}: {e}")
+        
+        self._response_cache[verb] = root
+        return root
     
     def identify(self) -> Dict:
         """Get repository information."""
-        params = {'verb': 'Identify'}
-        root = self._make_request(params)
+        root = self._make_cached_request('Identify')
         
         identify_elem = root.find('.//oai:Identify', self.namespaces)
         if identify_elem is None:
             raise Exception("Invalid Identify response")
         
-        result = {}
-        for child in identify_elem:
-            tag = child.tag.replace('{http://www.openarchives.org/OAI/2.0/}', '')
-            result[tag] = child.text
-        
-        return result
+        return _child_texts(identify_elem)
     
     def list_metadata_formats(self) -> List[Dict]:
         """Get supported metadata formats."""
-        params = {'verb': 'ListMetadataFormats'}
-        root = self._make_request(params)
+        root = self._make_cached_request('ListMetadataFormats')
         
-        formats = []
-        for format_elem in root.findall('.//oai:metadataFormat', self.namespaces):
-            format_info = {}
-            for child in format_elem:
-                tag = child.tag.replace('{http://www.openarchives.org/OAI/2.0/}', '')
-                format_info[tag] = child.text
-            formats.append(format_info)
-        
-        return formats
+        return [_child_texts(format_elem) for format_elem in root.findall('.//oai:metadataFormat', self.namespaces)]
     
     def list_sets(self) -> List[Dict]:
         """Get available sets."""
         params = {'verb': 'ListSets'}
         root = self._make_request(params)
         
-        sets = []
-        for set_elem in root.findall('.//oai:set', self.namespaces):
-            set_info = {}
-            for child in set_elem:
-                tag = child.tag.replace('{http://www.openarchives.org/OAI/2.0/}', '')
-                set_info[tag] = child.text
-            sets.append(set_info)
-        
-        return sets
+        return [_child_texts(set_elem) for set_elem in root.findall('.//oai:set', self.namespaces)]
     
     def list_records(self, 
                     metadata_prefix: str = 'oai_dc',
@@ -167,7 +221,7 @@ class OAIPMHClient:
         
         return records, next_token
     
-    def _parse_record(self, record_elem: ET.Element) -> Optional[Dict]:
+    def _parse_record(self, record_elem: ET._Element) -> Optional[Dict]:
         """Parse a single OAI-PMH record."""
         try:
             header_elem = record_elem.find('oai:header', self.namespaces)
@@ -177,8 +231,8 @@ class OAIPMHClient:
             # Check if record is deleted
             if header_elem.get('status') == 'deleted':
                 return {
-                    'identifier': header_elem.find('oai:identifier', self.namespaces).text,
-                    'datestamp': header_elem.find('oai:datestamp', self.namespaces).text,
+                    'identifier': _first(IDENTIFIER_XPATH, header_elem),
+                    'datestamp': _first(DATESTAMP_XPATH, header_elem),
                     'status': 'deleted'
                 }
             
@@ -198,23 +252,25 @@ class OAIPMHClient:
             logger.warning(f"Failed to parse record: {e}")
             return None
     
-    def _parse_dublin_core(self, header_elem: ET.Element, dc_elem: ET.Element) -> Dict:
+    def _parse_dublin_core(self, header_elem: ET._Element, dc_elem: ET._Element) -> Dict:
         """Parse Dublin Core metadata."""
         record = {
-            'identifier': header_elem.find('oai:identifier', self.namespaces).text,
-            'datestamp': header_elem.find('oai:datestamp', self.namespaces).text,
+            'identifier': _first(IDENTIFIER_XPATH, header_elem),
+            'datestamp': _first(DATESTAMP_XPATH, header_elem),
             'status': 'active'
         }
         
         # Extract arXiv ID from identifier (e.g., oai:arXiv.org:1234.5678)
         identifier = record['identifier']
-        if ':' in identifier:
+        if identifier and ':' in identifier:
             arxiv_id = identifier.split(':')[-1]
             record['arxiv_id'] = arxiv_id
         
-        # Parse Dublin Core elements
-        for child in dc_elem:
-            tag = child.tag.replace('{http://purl.org/dc/elements/1.1/}', '')
+        # Parse Dublin Core elements (elements only - skips comments/PIs)
+        for child in dc_elem.iterchildren(ET.Element):
+            tag = child.tag
+            if tag.startswith(DC_PREFIX):
+                tag = tag[len(DC_PREFIX):]
             
             if tag in record:
                 # Handle multiple values
@@ -226,10 +282,7 @@ class OAIPMHClient:
                 record[tag] = child.text
         
         # Parse sets (subjects/categories)
-        sets = []
-        for set_elem in header_elem.findall('oai:setSpec', self.namespaces):
-            sets.append(set_elem.text)
-        record['sets'] = sets
+        record['sets'] = SET_SPEC_XPATH(header_elem)
         
         return record
     
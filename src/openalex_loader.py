@@ -3,23 +3,22 @@ OPTIMIZED OpenAlex Citation Loader for handling 350GB of data efficiently
 
 Key optimizations:
 1. Bulk Neo4j operations with larger batches
-2. Pre-load Neo4j DOI set into memory
+2. Pre-load Neo4j DOI hashes into a sorted array (vectorized membership tests)
 3. Streaming processing with minimal memory footprint
 4. Detailed performance tracking
 """
 
-import json
 import gzip
 import logging
 import time
 from pathlib import Path
-from typing import Dict, Set, List, Optional
+from typing import Dict, List, Optional, Iterator
 from datetime import datetime
 import os
+import orjson
+import numpy as np
 from neo4j import GraphDatabase
-from pydantic import BaseModel, Field
-
-from data_models.openalex import OpenAlexWork
+from pydantic import BaseModel
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +27,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+READ_CHUNK_SIZE = 4 * 1024 * 1024  # 4 MB of decompressed data per read
+DOI_PREFIX = "https://doi.org/"
+DOI_PREFIX_LEN = len(DOI_PREFIX)
+
+class GzipLineReader:
+    """Yield raw JSONL lines from a gzip file without per-line decoding.
+    
+    Reads large binary chunks and splits them on newlines, carrying the trailing
+    partial line over to the next chunk. `bytes_read` tracks how much of the
+    compressed file has been consumed so far.
+    """
+    
+    def __init__(self, file_path: Path, chunk_size: int = READ_CHUNK_SIZE):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+    
+    def __iter__(self) -> Iterator[bytes]:
+        tail = b""
+        with open(self.file_path, 'rb') as raw, gzip.GzipFile(fileobj=raw) as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                self.bytes_read = raw.tell()
+                lines = (tail + chunk).split(b"\n")
+                tail = lines.pop()
+                for line in lines:
+                    if line:
+                        yield line
+        if tail:
+            yield tail
+
 class OptimizedPerformanceStats(BaseModel):
     """Performance statistics for optimized loader"""
     files_processed: int = 0
@@ -45,103 +77,152 @@ class OptimizedCitationLoader:
     def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str):
         self.driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
         self.data_dir = Path("data/works")
-        self.neo4j_dois = None  # Will cache Neo4j DOIs in memory
+        self.neo4j_doi_hashes = None  # Will cache sorted Neo4j DOI hashes in memory
+        self._ensure_indexes()
         
     def close(self):
         """Close Neo4j connection"""
         self.driver.close()
     
-    def _load_neo4j_dois(self) -> Set[str]:
-        """Load all Neo4j DOIs into memory for fast lookup"""
-        if self.neo4j_dois is not None:
-            return self.neo4j_dois
-            
-        logger.info("Loading all Neo4j DOIs into memory...")
-        start_time = time.time()
-        
+    def _ensure_indexes(self):
+        """Ensure the DOI index used for paged DOI loading exists"""
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (p:Paper) 
-                WHERE p.doi IS NOT NULL AND p.doi <> ''
-                RETURN p.doi
-            """)
+            session.run("CREATE INDEX paper_doi_index IF NOT EXISTS FOR (p:Paper) ON (p.doi)")
+    
+    def _load_neo4j_dois(self, page_size: int = 500000) -> np.ndarray:
+        """Load hashes of all Neo4j DOIs into a sorted int64 array for fast lookup.
+        
+        DOIs are paged in index order (keyset pagination on p.doi) so Neo4j never
+        materializes the whole result at once and Python starts consuming early.
+        Only the 8-byte hashes are kept; a hash collision just sends one extra
+        candidate to Neo4j, where the MATCH on the real DOI filters it out.
+        Built-in hash() is salted per process, so the array must never be
+        shared with another process.
+        """
+        if self.neo4j_doi_hashes is not None:
+            return self.neo4j_doi_hashes
             
-            self.neo4j_dois = {record["p.doi"] for record in result}
+        logger.info("Loading all Neo4j DOI hashes into memory...")
+        start_time = time.monotonic()
+        
+        pages = []
+        last_doi = ""
+        with self.driver.session(fetch_size=50000) as session:
+            while True:
+                # `p.doi > ''` also excludes NULL and empty DOIs
+                result = session.run("""
+                    MATCH (p:Paper)
+                    WHERE p.doi > $after
+                    RETURN p.doi AS doi
+                    ORDER BY p.doi
+                    LIMIT $page_size
+                """, after=last_doi, page_size=page_size)
+                
+                page = [record["doi"] for record in result]
+                if not page:
+                    break
+                pages.append(np.fromiter((hash(doi) for doi in page), dtype=np.int64, count=len(page)))
+                last_doi = page[-1]
+                
+                if len(page) < page_size:
+                    break
         
-        load_time = time.time() - start_time
-        logger.info(f"Loaded {len(self.neo4j_dois):,} DOIs in {load_time:.2f} seconds")
-        return self.neo4j_dois
+        self.neo4j_doi_hashes = np.sort(np.concatenate(pages)) if pages else np.empty(0, dtype=np.int64)
+        load_time = time.monotonic() - start_time
+        logger.info(f"Loaded {len(self.neo4j_doi_hashes):,} DOI hashes in {load_time:.2f} seconds")
+        return self.neo4j_doi_hashes
+    
+    def _filter_known_dois(self, candidates: List[Dict[str, str]], candidate_hashes: np.ndarray) -> List[Dict[str, str]]:
+        """Keep only candidates whose DOI hash is in Neo4j (one searchsorted per batch)"""
+        known = self.neo4j_doi_hashes
+        if not candidates or len(known) == 0:
+            return []
+        
+        hashes = candidate_hashes[:len(candidates)]
+        idx = np.searchsorted(known, hashes)
+        np.minimum(idx, len(known) - 1, out=idx)
+        hits = np.flatnonzero(known[idx] == hashes)
+        return [candidates[i] for i in hits]
     
     def process_file_optimized(self, file_path: Path, max_records: int = None, batch_size: int = 5000) -> OptimizedPerformanceStats:
         """Process single file with optimizations"""
         logger.info(f"Processing {file_path.name} (batch_size={batch_size})")
         
-        # Load Neo4j DOIs if not already loaded
-        neo4j_dois = self._load_neo4j_dois()
+        # Load Neo4j DOI hashes if not already loaded
+        self._load_neo4j_dois()
         
         stats = OptimizedPerformanceStats()
-        start_time = time.time()
-        
-        # Get file size
-        file_size_mb = file_path.stat().st_size / (1024 * 1024)
+        start_time = time.monotonic()
         
+        reader = GzipLineReader(file_path)
         update_batch = []
         
+        # Candidates are checked against Neo4j DOIs in vectorized blocks
+        candidates = []
+        candidate_hashes = np.empty(batch_size, dtype=np.int64)
+        
         try:
-            with gzip.open(file_path, 'rt') as f:
-                for line_num, line in enumerate(f, 1):
-                    if max_records and line_num > max_records:
-                        break
+            for line_num, line in enumerate(reader, 1):
+                if max_records and line_num > max_records:
+                    break
+                
+                try:
+                    data = orjson.loads(line)
+                    stats.total_works_processed += 1
+                    
+                    # Only doi and id are needed, so skip OpenAlexWork validation
+                    doi = data.get('doi')
+                    openalex_id = data.get('id')
                     
-                    try:
-                        data = json.loads(line.strip())
-                        work = OpenAlexWork(**data)
-                        stats.total_works_processed += 1
+                    if doi and openalex_id:
+                        stats.works_with_doi += 1
+                        clean_doi = doi[DOI_PREFIX_LEN:] if doi.startswith(DOI_PREFIX) else doi
                         
-                        if work.doi and work.id:
-                            stats.works_with_doi += 1
-                            clean_doi = work.doi.replace("https://doi.org/", "")
-                            
-                            # Fast in-memory lookup instead of database query
-                            if clean_doi in neo4j_dois:
-                                update_batch.append({
-                                    'doi': clean_doi,
-                                    'openalex_id': work.id
-                                })
-                            
-                            # Process batch when full
-                            if len(update_batch) >= batch_size:
-                                matched = self._process_batch_bulk(update_batch)
-                                stats.neo4j_matches += matched
-                                update_batch = []
+                        candidate_hashes[len(candidates)] = hash(clean_doi)
+                        candidates.append({
+                            'doi': clean_doi,
+                            'openalex_id': openalex_id
+                        })
                         
-                        # Progress logging
-                        if line_num % 50000 == 0:
-                            elapsed = time.time() - start_time
-                            works_per_sec = stats.total_works_processed / elapsed if elapsed > 0 else 0
-                            
-                            logger.info(f"Progress: {line_num:,} records processed")
-                            logger.info(f"  Speed: {works_per_sec:.0f} works/sec")
-                            logger.info(f"  Matches: {stats.neo4j_matches:,} / {stats.works_with_doi:,} DOIs")
-                            logger.info(f"  Match rate: {stats.neo4j_matches/stats.works_with_doi*100 if stats.works_with_doi > 0 else 0:.3f}%")
-                            
-                    except Exception as e:
-                        if line_num % 10000 == 0:  # Only log parsing errors occasionally
-                            logger.warning(f"Error parsing line {line_num}: {e}")
-                        continue
-                
-                # Process remaining batch
-                if update_batch:
-                    matched = self._process_batch_bulk(update_batch)
-                    stats.neo4j_matches += matched
+                        # Fast in-memory lookup instead of database query
+                        if len(candidates) == batch_size:
+                            update_batch.extend(self._filter_known_dois(candidates, candidate_hashes))
+                            candidates = []
+                        
+                        # Process batch when full
+                        if len(update_batch) >= batch_size:
+                            matched = self._process_batch_bulk(update_batch)
+                            stats.neo4j_matches += matched
+                            update_batch = []
+                    
+                    # Progress logging (deferred %-formatting, skipped entirely when INFO is off)
+                    if line_num % 50000 == 0 and logger.isEnabledFor(logging.INFO):
+                        elapsed = time.monotonic() - start_time
+                        works_per_sec = stats.total_works_processed / elapsed if elapsed > 0 else 0
+                        match_rate = stats.neo4j_matches / stats.works_with_doi * 100 if stats.works_with_doi > 0 else 0
+                        
+                        logger.info("Progress: %d records processed", line_num)
+                        logger.info("  Speed: %.0f works/sec", works_per_sec)
+                        logger.info("  Matches: %d / %d DOIs", stats.neo4j_matches, stats.works_with_doi)
+                        logger.info("  Match rate: %.3f%%", match_rate)
+                        
+                except Exception as e:
+                    if line_num % 10000 == 0:  # Only log parsing errors occasionally
+                        logger.warning("Error parsing line %d: %s", line_num, e)
+                    continue
+            
+            # Process remaining batch
+            update_batch.extend(self._filter_known_dois(candidates, candidate_hashes))
+            if update_batch:
+                matched = self._process_batch_bulk(update_batch)
+                stats.neo4j_matches += matched
                 
         except Exception as e:
             logger.error(f"Error processing file {file_path}: {e}")
             
         # Calculate final statistics
-        end_time = time.time()
-        stats.processing_time_seconds = end_time - start_time
-        stats.data_processed_mb = file_size_mb * (stats.total_works_processed / max_records if max_records else 1.0)
+        stats.processing_time_seconds = time.monotonic() - start_time
+        stats.data_processed_mb = reader.bytes_read / (1024 * 1024)
         
         if stats.processing_time_seconds > 0:
             stats.works_per_second = stats.total_works_processed / stats.processing_time_seconds
@@ -157,7 +238,9 @@ class OptimizedCitationLoader:
         if not updates:
             return 0
         
-        start_time = time.time()
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            start_time = time.monotonic()
         
         with self.driver.session() as session:
             # Use UNWIND for bulk operations - much faster than individual queries
@@ -165,16 +248,16 @@ class OptimizedCitationLoader:
                 UNWIND $updates AS update
                 MATCH (p:Paper {doi: update.doi})
                 SET p.openalex_id = update.openalex_id
-                RETURN count(p) as matched_papers
             """, updates=updates)
             
-            matched = result.single()["matched_papers"]
+            # One property write per matched paper - read it from the summary
+            # counters instead of aggregating and streaming a count row
+            matched = result.consume().counters.properties_set
             
-        processing_time = time.time() - start_time
-        
-        if matched > 0:
+        if debug and matched > 0:
+            processing_time = time.monotonic() - start_time
             rate = matched / processing_time if processing_time > 0 else 0
-            logger.debug(f"Bulk update: {matched:,} matches in {processing_time:.2f}s ({rate:.0f} matches/sec)")
+            logger.debug("Bulk update: %d matches in %.2fs (%.0f matches/sec)", matched, processing_time, rate)
         
         return matched
     
@@ -216,11 +299,11 @@ class OptimizedCitationLoader:
         logger.info("Estimated time: ~12 hours for 350GB")
         logger.info("=" * 80)
         
-        # Load Neo4j DOIs once for all files
-        neo4j_dois = self._load_neo4j_dois()
+        # Load Neo4j DOI hashes once for all files
+        self._load_neo4j_dois()
         
         total_stats = OptimizedPerformanceStats()
-        start_time = time.time()
+        start_time = time.monotonic()
         
         # Get all data directories sorted by date
         date_dirs = sorted([d for d in self.data_dir.iterdir() if d.is_dir()])
@@ -249,7 +332,7 @@ class OptimizedCitationLoader:
                 total_stats.data_processed_mb += file_stats.data_processed_mb
                 
                 # Update overall timing
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
                 total_stats.processing_time_seconds = elapsed
                 if elapsed > 0:
                     total_stats.works_per_second = total_stats.total_works_processed / elapsed
@@ -5,12 +5,12 @@ Identify bottlenecks in the OpenAlex loader that's causing 3+ day processing tim
 """
 
 import time
-import json
 import gzip
 import logging
 from pathlib import Path
 from typing import Dict, Set
 import os
+import orjson
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
 
@@ -65,22 +65,28 @@ def diagnose_performance():
     sample_fetch_time = time.time() - start_time
     logger.info(f"  Fetch 10K DOIs: {sample_fetch_time:.2f} seconds")
     
-    # Test 4: Full DOI loading (the current bottleneck?)
-    logger.info("\\nTest 4: FULL DOI Loading (Current Implementation)")
-    start_time = time.time()
+    # Test 4: Server-side DOI membership (replaces loading every DOI into Python)
+    logger.info("\\nTest 4: Server-side DOI Membership (index lookup)")
     with driver.session() as session:
         result = session.run("""
-            MATCH (p:Paper) 
-            WHERE p.doi IS NOT NULL AND p.doi <> ''
-            RETURN p.doi
+            SHOW INDEXES YIELD labelsOrTypes, properties
+            WHERE 'Paper' IN labelsOrTypes AND properties = ['doi']
+            RETURN count(*) AS doi_indexes
         """)
-        all_dois = {record["p.doi"] for record in result}
-    full_load_time = time.time() - start_time
-    logger.info(f"  Load ALL DOIs into memory: {full_load_time:.2f} seconds ({len(all_dois):,} DOIs)")
+        has_doi_index = result.single()["doi_indexes"] > 0
+    if not has_doi_index:
+        logger.error("🚨 BOTTLENECK FOUND: no index on :Paper(doi) - every DOI lookup is a label scan!")
     
-    if full_load_time > 60:
-        logger.error("🚨 BOTTLENECK FOUND: DOI loading is taking too long!")
-        logger.error("   This is likely the main performance issue.")
+    start_time = time.time()
+    with driver.session() as session:
+        result = session.run("""
+            MATCH (p:Paper)
+            WHERE p.doi IN $sample
+            RETURN count(p) as found
+        """, sample=dois)
+        found = result.single()["found"]
+    membership_time = time.time() - start_time
+    logger.info(f"  Look up {len(dois):,} sampled DOIs: {membership_time:.2f} seconds ({found:,} found)")
     
     # Test 5: Batch update performance
     logger.info("\\nTest 5: Batch Update Performance")
@@ -109,14 +115,14 @@ def diagnose_performance():
     if test_file.exists():
         start_time = time.time()
         record_count = 0
-        with gzip.open(test_file, 'rt') as f:
+        with gzip.open(test_file, 'rb') as f:
             for line_num, line in enumerate(f, 1):
                 if line_num > 10000:  # Test first 10K records
                     break
                 try:
-                    data = json.loads(line.strip())
+                    data = orjson.loads(line)
                     record_count += 1
-                except:
+                except orjson.JSONDecodeError:
                     continue
         file_time = time.time() - start_time
         logger.info(f"  Read/parse 10K records: {file_time:.2f} seconds ({record_count:,} valid)")
@@ -129,19 +135,18 @@ def diagnose_performance():
     memory_mb = process.memory_info().rss / 1024 / 1024
     logger.info(f"  Current memory usage: {memory_mb:.1f} MB")
     
-    if len(all_dois) > 0:
-        memory_per_doi = memory_mb / len(all_dois) * 1000
-        logger.info(f"  Memory per DOI: {memory_per_doi:.3f} KB")
-    
     # Analysis and recommendations
     logger.info("\\n" + "=" * 80)
     logger.info("🔍 PERFORMANCE ANALYSIS & RECOMMENDATIONS")
     logger.info("=" * 80)
     
-    if full_load_time > 30:
-        logger.error("❌ MAJOR ISSUE: DOI loading is too slow!")
-        logger.error("   Recommendation: Implement streaming/chunked DOI lookup")
-        logger.error("   Alternative: Use database-side filtering instead of in-memory")
+    if not has_doi_index:
+        logger.error("❌ MAJOR ISSUE: :Paper(doi) is not indexed!")
+        logger.error("   Recommendation: CREATE INDEX paper_doi_index IF NOT EXISTS FOR (p:Paper) ON (p.doi)")
+        
+    if membership_time > 1:
+        logger.warning("⚠️  Server-side DOI lookups are slow")
+        logger.warning("   Recommendation: Check that the DOI index is ONLINE")
         
     if batch_time > 0.1:
         logger.warning("⚠️  Batch updates are slow")
@@ -151,13 +156,6 @@ def diagnose_performance():
         logger.warning("⚠️  High memory usage detected")
         logger.warning("   Recommendation: Implement memory-efficient streaming")
     
-    # Estimate current performance
-    if full_load_time > 0:
-        estimated_files_per_hour = 3600 / full_load_time  # Assuming DOI load per file
-        logger.info(f"\\n📊 ESTIMATED PERFORMANCE:")
-        logger.info(f"  Files processable per hour: {estimated_files_per_hour:.1f}")
-        logger.info(f"  This explains the 3+ day processing time!")
-    
     driver.close()
 
 if __name__ == "__main__":
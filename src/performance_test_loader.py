@@ -2,18 +2,59 @@
 Performance-optimized OpenAlex Citation Loader with detailed timing and throughput metrics
 """
 
-import json
-import gzip
+import io
 import logging
+import queue
+import re
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Set, List, Optional
+from typing import Dict, Set, List, Optional, Iterator, Tuple
 from datetime import datetime
 import os
-from neo4j import GraphDatabase
-from pydantic import BaseModel, Field
+import orjson
+from neo4j import GraphDatabase, WRITE_ACCESS
 
 from data_models.openalex import OpenAlexWork
+from neo4j_apoc import APOC_ITERATE_RETURN, apoc_properties_set, has_apoc_iterate
+
+try:
+    import rapidgzip  # Optional: parallel gzip decompression across cores
+except ImportError:
+    rapidgzip = None
+
+try:
+    import pyarrow as pa  # Optional: DOI -> OpenAlex ID Parquet sidecars between runs
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Targeted field extraction straight from the raw line bytes - only these two
+# fields are used, so the rest of the ~15KB record is never parsed or decoded.
+# Both URL schemes are accepted, and so are JSON-escaped slashes; a value holding
+# any escape is decoded with orjson instead (see _extract_pairs)
+_ID_RE = re.compile(rb'"id":\s*"(https?:\\?/\\?/openalex\.org\\?/W\d+)"')
+_DOI_RE = re.compile(rb'"doi":\s*"(https?:\\?/\\?/doi\.org\\?/[^"]+)"')
+
+# Compressed bytes fed to zlib per read; the input buffer is reused across reads
+INFLATE_CHUNK_SIZE = 64 * 1024
+
+# Upper bound on concurrent writer sessions (and so on batches in flight) per loader
+MAX_CONNECTION_POOL_SIZE = 50
+
+# Batches slower than this are logged individually; faster ones only show up in progress lines
+SLOW_BATCH_SECONDS = 0.5
+
+# Records parsed per chunk; exceptions and parse timing are handled at this granularity, not per line
+RECORD_CHUNK_SIZE = 1000
+
+# Extracted (doi, openalex_id) pairs are persisted next to each part file after a full read
+SIDECAR_SUFFIX = ".doi_oaid.parquet"
 
 # Configure logging with more detail
 logging.basicConfig(
@@ -22,12 +63,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class PerformanceStats(BaseModel):
-    """Detailed performance statistics"""
+@dataclass(slots=True)
+class PerformanceStats:
+    """Detailed performance statistics (plain slots dataclass - updated from the hot loop)"""
     total_files_processed: int = 0
     total_works_processed: int = 0
     total_works_with_doi: int = 0
     total_neo4j_matches: int = 0
+    duplicate_dois_skipped: int = 0
+    failed_batches: int = 0
     total_processing_time_seconds: float = 0.0
     avg_works_per_second: float = 0.0
     avg_mb_per_second: float = 0.0
@@ -39,17 +83,166 @@ class PerformanceStats(BaseModel):
     neo4j_matching_time: float = 0.0
     batch_processing_time: float = 0.0
 
+def iter_inflated_lines(file_path: Path, chunk_size: int = INFLATE_CHUNK_SIZE) -> Iterator[bytes]:
+    """Stream-decompress a gzip file with zlib and yield raw lines.
+    
+    Compressed input is read into one reusable buffer and lines are split out of
+    the decompressed chunks directly, avoiding gzip's per-readline allocations.
+    """
+    in_buf = bytearray(chunk_size)
+    in_view = memoryview(in_buf)
+    decomp = zlib.decompressobj(32 + zlib.MAX_WBITS)  # 32: expect a gzip header
+    tail = b""
+    
+    with open(file_path, 'rb') as fh:
+        while True:
+            n = fh.readinto(in_buf)
+            if not n:
+                break
+            data = decomp.decompress(in_view[:n])
+            # Concatenated gzip members: restart on whatever follows the member that ended
+            while decomp.eof and decomp.unused_data:
+                rest = decomp.unused_data
+                decomp = zlib.decompressobj(32 + zlib.MAX_WBITS)
+                data += decomp.decompress(rest)
+            if not data:
+                continue
+            
+            lines = (tail + data).split(b"\n")
+            tail = lines.pop()
+            for line in lines:
+                if line:
+                    yield line
+    
+    tail += decomp.flush()
+    for line in tail.split(b"\n"):
+        if line:
+            yield line
+
+@contextmanager
+def open_gzip_lines(file_path: Path, export_index: bool = False) -> Iterator[Iterator[bytes]]:
+    """Open a gzip file as an iterator of raw lines, decompressing in parallel when rapidgzip is available.
+    
+    rapidgzip reuses a persisted seek-point index (`<file>.rgzidx`) so later runs skip
+    block-boundary discovery. Set `export_index` when the whole file is read; exporting
+    after a partial read would force an extra full decompression pass.
+    """
+    if rapidgzip is None:
+        lines = iter_inflated_lines(file_path)
+        try:
+            yield lines
+        finally:
+            lines.close()
+        return
+    
+    index_path = file_path.with_name(file_path.name + ".rgzidx")
+    with rapidgzip.open(str(file_path), parallelization=os.cpu_count()) as raw:
+        has_index = is_fresh(index_path, file_path)
+        if has_index:
+            raw.import_index(str(index_path))
+        
+        yield io.BufferedReader(raw)
+        
+        if export_index and not has_index:
+            raw.export_index(str(index_path))
+
+def is_fresh(derived_path: Path, source_path: Path) -> bool:
+    """True if a file derived from a part file (sidecar, seek index) exists and is at least as new as it"""
+    try:
+        return derived_path.stat().st_mtime >= source_path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+def sidecar_path(file_path: Path) -> Path:
+    """Parquet sidecar location for a part file: part_NNN.gz -> part_NNN.doi_oaid.parquet"""
+    return file_path.with_name(file_path.name.removesuffix(".gz") + SIDECAR_SUFFIX)
+
+def write_sidecar(file_path: Path, dois: List[str], openalex_ids: List[str], total_works: int):
+    """Persist the extracted pairs (zstd, dictionary-encoded); written to a temp file and renamed into place"""
+    path = sidecar_path(file_path)
+    table = pa.Table.from_pydict({'doi': dois, 'openalex_id': openalex_ids})
+    table = table.replace_schema_metadata({b'total_works': str(total_works).encode()})
+    tmp_path = path.with_name(path.name + ".tmp")
+    pq.write_table(table, tmp_path, compression="zstd", use_dictionary=True)
+    os.replace(tmp_path, path)
+
 class PerformanceTestLoader:
     """Performance-optimized loader with detailed metrics"""
     
-    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str):
-        self.driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+    # Fixed query text so every batch hits Neo4j's query-plan cache
+    UPSERT_OPENALEX_ID = (
+        "UNWIND $updates AS update "
+        "MATCH (p:Paper {doi: update.doi}) "
+        "SET p.openalex_id = update.openalex_id"
+    )
+    # With APOC, Neo4j splits one large client batch into parallel server-side transactions
+    UPSERT_OPENALEX_ID_APOC = (
+        "CALL apoc.periodic.iterate("
+        "'UNWIND $updates AS update RETURN update', "
+        "'MATCH (p:Paper {doi: update.doi}) SET p.openalex_id = update.openalex_id', "
+        "{batchSize: 10000, parallel: true, params: {updates: $updates}}) "
+        + APOC_ITERATE_RETURN
+    )
+    UNWIND_BATCH_SIZE = 1000
+    APOC_BATCH_SIZE = 100000
+    
+    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str, validate: bool = False,
+                 writer_threads: int = 4):
+        # Kept so file-level worker processes can open their own connections
+        self._connection = (neo4j_uri, neo4j_user, neo4j_password)
+        # Tuned connection pool shared by all writer sessions
+        self.driver = GraphDatabase.driver(
+            neo4j_uri,
+            auth=(neo4j_user, neo4j_password),
+            max_connection_lifetime=3600,
+            max_connection_pool_size=MAX_CONNECTION_POOL_SIZE,
+            connection_acquisition_timeout=60,
+            # execute_write retries transient errors (e.g. deadlocks on the DOI index) for up to this long
+            max_transaction_retry_time=15
+        )
+        self.database = os.getenv("NEO4J_DATABASE", "neo4j")
         self.data_dir = Path("data/works")
+        # Full JSON parse + OpenAlexWork validation instead of targeted field extraction
+        self.validate = validate
+        # Concurrent Neo4j writers fed by the file-parsing thread; each holds one pooled
+        # connection, so the pool size caps how many batches can be in flight
+        self.writer_threads = max(1, min(writer_threads, MAX_CONNECTION_POOL_SIZE))
+        # DOIs already sent to Neo4j during this run (repeated works across update dirs)
+        self._seen = set()
+        
+        # One long-lived write session per thread instead of one per batch
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        
+        self._ensure_indexes()
+        self.use_apoc = has_apoc_iterate(self.driver, self.database)
+        if self.use_apoc:
+            logger.info("APOC detected - using apoc.periodic.iterate for batch updates")
         
     def close(self):
-        """Close Neo4j connection"""
+        """Close writer sessions and the Neo4j connection"""
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
         self.driver.close()
     
+    def _get_session(self):
+        """Return this thread's write session, opening it on first use"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.driver.session(database=self.database, default_access_mode=WRITE_ACCESS)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+    
+    def _ensure_indexes(self):
+        """Ensure the DOI index exists so UNWIND/MATCH batches do the membership test server-side"""
+        with self.driver.session(database=self.database) as session:
+            session.run("CREATE INDEX paper_doi_index IF NOT EXISTS FOR (p:Paper) ON (p.doi)")
+    
     def test_single_file_performance(self, file_path: Path, max_records: int = None) -> PerformanceStats:
         """Test performance on a single file with detailed metrics"""
         logger.info(f"Testing performance on {file_path}")
@@ -62,83 +255,47 @@ class PerformanceTestLoader:
         stats.total_data_size_mb = file_size_mb
         logger.info(f"File size: {file_size_mb:.2f} MB")
         
-        update_batch = []
-        batch_size = 1000
+        batch_size = self.APOC_BATCH_SIZE if self.use_apoc else self.UNWIND_BATCH_SIZE
         
-        # Timing variables
-        file_read_start = time.time()
-        json_parse_time = 0.0
-        neo4j_time = 0.0
+        # Parsing (this thread) and Neo4j writes (writer pool) overlap; the bounded
+        # queue applies backpressure so parsed batches can't pile up in memory
+        batch_queue = queue.Queue(maxsize=2 * self.writer_threads)
+        stats_lock = threading.Lock()
+        writers = ThreadPoolExecutor(max_workers=self.writer_threads)
+        for _ in range(self.writer_threads):
+            writers.submit(self._batch_writer, batch_queue, stats, stats_lock)
+        
+        # Full (--full), non-validating reads are cached as a Parquet sidecar; partial test
+        # reads neither use nor write it, so their timings still measure gunzip + parse.
+        # A sidecar older than its part file is stale and gets rebuilt
+        sidecar = sidecar_path(file_path)
+        use_sidecar = pq is not None and max_records is None and not self.validate
         
         try:
-            with gzip.open(file_path, 'rt') as f:
-                stats.file_reading_time = time.time() - file_read_start
+            if use_sidecar and is_fresh(sidecar, file_path):
+                logger.info(f"Using cached sidecar {sidecar.name}")
+                self._feed_from_sidecar(sidecar, batch_queue, batch_size, stats)
+            else:
+                sidecar_dois, sidecar_openalex_ids = [], []
+                self._feed_from_gzip(file_path, max_records, batch_queue, batch_size, stats,
+                                     sidecar_dois if use_sidecar else None, sidecar_openalex_ids)
                 
-                for line_num, line in enumerate(f, 1):
-                    if max_records and line_num > max_records:
-                        break
-                    
-                    # Time JSON parsing
-                    parse_start = time.time()
-                    try:
-                        data = json.loads(line.strip())
-                        work = OpenAlexWork(**data)
-                        json_parse_time += time.time() - parse_start
-                        
-                        stats.total_works_processed += 1
-                        
-                        if work.doi and work.id:
-                            stats.total_works_with_doi += 1
-                            clean_doi = work.doi.replace("https://doi.org/", "")
-                            
-                            update_batch.append({
-                                'doi': clean_doi,
-                                'openalex_id': work.id
-                            })
-                            
-                            # Process batch
-                            if len(update_batch) >= batch_size:
-                                batch_start = time.time()
-                                matched = self._process_batch_with_timing(update_batch)
-                                batch_time = time.time() - batch_start
-                                
-                                stats.total_neo4j_matches += matched
-                                neo4j_time += batch_time
-                                update_batch = []
-                        
-                        # Progress logging
-                        if line_num % 10000 == 0:
-                            elapsed = time.time() - start_time
-                            works_per_sec = stats.total_works_processed / elapsed if elapsed > 0 else 0
-                            mb_per_sec = (file_size_mb * (line_num / stats.total_works_processed if stats.total_works_processed > 0 else 0)) / elapsed if elapsed > 0 else 0
-                            
-                            logger.info(f"Progress: {line_num:,} records processed")
-                            logger.info(f"  Speed: {works_per_sec:.0f} works/sec, {mb_per_sec:.2f} MB/sec")
-                            logger.info(f"  Works with DOI: {stats.total_works_with_doi:,}")
-                            logger.info(f"  Neo4j matches: {stats.total_neo4j_matches:,}")
-                            
-                    except Exception as e:
-                        logger.warning(f"Error parsing line {line_num}: {e}")
-                        continue
-                
-                # Process remaining batch
-                if update_batch:
-                    batch_start = time.time()
-                    matched = self._process_batch_with_timing(update_batch)
-                    batch_time = time.time() - batch_start
-                    
-                    stats.total_neo4j_matches += matched
-                    neo4j_time += batch_time
+                if use_sidecar:
+                    write_sidecar(file_path, sidecar_dois, sidecar_openalex_ids, stats.total_works_processed)
+                    logger.info(f"Wrote sidecar {sidecar.name} ({len(sidecar_dois):,} pairs)")
                 
         except Exception as e:
             logger.error(f"Error processing file {file_path}: {e}")
+        finally:
+            # One sentinel per writer, then wait for in-flight batches to finish
+            for _ in range(self.writer_threads):
+                batch_queue.put(None)
+            writers.shutdown(wait=True)
             
         # Calculate final statistics
         end_time = time.time()
         stats.total_processing_time_seconds = end_time - start_time
-        stats.json_parsing_time = json_parse_time
-        stats.neo4j_matching_time = neo4j_time
-        stats.batch_processing_time = neo4j_time
+        stats.batch_processing_time = stats.neo4j_matching_time
         stats.total_files_processed = 1
         
         if stats.total_processing_time_seconds > 0:
@@ -148,6 +305,166 @@ class PerformanceTestLoader:
         self._log_performance_summary(stats, file_path)
         return stats
     
+    def _feed_from_sidecar(self, sidecar: Path, batch_queue: queue.Queue, batch_size: int, stats: PerformanceStats):
+        """Queue batches straight from a Parquet sidecar - no gunzip, no JSON"""
+        file_read_start = time.time()
+        table = pq.read_table(sidecar)
+        stats.file_reading_time = time.time() - file_read_start
+        stats.total_works_processed = int(table.schema.metadata[b'total_works'])
+        stats.total_works_with_doi = table.num_rows
+        
+        update_batch = []
+        for offset in range(0, table.num_rows, batch_size):
+            # Rows already come out as {'doi': ..., 'openalex_id': ...} update maps
+            for update in table.slice(offset, batch_size).to_pylist():
+                if update['doi'] in self._seen:
+                    stats.duplicate_dois_skipped += 1
+                    continue
+                self._seen.add(update['doi'])
+                update_batch.append(update)
+                if len(update_batch) >= batch_size:
+                    batch_queue.put(update_batch)
+                    update_batch = []
+        
+        if update_batch:
+            batch_queue.put(update_batch)
+    
+    def _feed_from_gzip(self, file_path: Path, max_records: Optional[int], batch_queue: queue.Queue,
+                        batch_size: int, stats: PerformanceStats,
+                        sidecar_dois: Optional[List[str]], sidecar_openalex_ids: List[str]):
+        """Parse the gzipped part file and queue update batches, collecting every
+        (doi, openalex_id) pair into the sidecar lists when they are given"""
+        start_time = time.time()
+        file_size_mb = stats.total_data_size_mb
+        update_batch = []
+        parse_ns = 0
+        
+        with open_gzip_lines(file_path, export_index=max_records is None) as f:
+            stats.file_reading_time = time.time() - start_time
+            
+            line_num = 0
+            while True:
+                chunk_size = RECORD_CHUNK_SIZE if not max_records else min(RECORD_CHUNK_SIZE, max_records - line_num)
+                chunk = list(islice(f, chunk_size))
+                if not chunk:
+                    break
+                
+                # Exceptions are handled per chunk, not per line; a failing chunk is re-run line by line
+                parse_start = time.perf_counter_ns()
+                try:
+                    pairs, works = self._extract_pairs(chunk)
+                except (ValueError, TypeError):
+                    pairs, works = self._extract_pairs_line_by_line(chunk, line_num)
+                parse_ns += time.perf_counter_ns() - parse_start
+                
+                line_num += len(chunk)
+                stats.total_works_processed += works
+                stats.total_works_with_doi += len(pairs)
+                
+                for doi, openalex_id in pairs:
+                    clean_doi = doi.removeprefix("https://doi.org/").removeprefix("http://doi.org/")
+                    if sidecar_dois is not None:
+                        sidecar_dois.append(clean_doi)
+                        sidecar_openalex_ids.append(openalex_id)
+                    
+                    if clean_doi in self._seen:
+                        stats.duplicate_dois_skipped += 1
+                        continue
+                    self._seen.add(clean_doi)
+                    update_batch.append({
+                        'doi': clean_doi,
+                        'openalex_id': openalex_id
+                    })
+                    
+                    # Hand full batches to the writer pool
+                    if len(update_batch) >= batch_size:
+                        batch_queue.put(update_batch)
+                        update_batch = []
+                
+                # Progress logging (nothing is computed or formatted unless INFO is enabled)
+                if line_num % 10000 == 0 and logger.isEnabledFor(logging.INFO):
+                    elapsed = time.time() - start_time
+                    works_per_sec = stats.total_works_processed / elapsed if elapsed > 0 else 0
+                    mb_per_sec = (file_size_mb * (line_num / stats.total_works_processed if stats.total_works_processed > 0 else 0)) / elapsed if elapsed > 0 else 0
+                    
+                    logger.info("Progress: %d records processed", line_num)
+                    logger.info("  Speed: %.0f works/sec, %.2f MB/sec", works_per_sec, mb_per_sec)
+                    logger.info("  Works with DOI: %d", stats.total_works_with_doi)
+                    logger.info("  Neo4j matches: %d", stats.total_neo4j_matches)
+            
+            # Process remaining batch
+            if update_batch:
+                batch_queue.put(update_batch)
+        
+        stats.json_parsing_time = parse_ns / 1e9
+    
+    def _extract_pairs(self, lines: List[bytes]) -> Tuple[List[Tuple[str, str]], int]:
+        """Fast path: (doi, openalex_id) for every record in the chunk that has both, and the number
+        of works seen (lines without an OpenAlex work id - blank or not JSON - are not works);
+        raises on bad input"""
+        pairs = []
+        if self.validate:
+            for line in lines:
+                work = OpenAlexWork(**orjson.loads(line))
+                if work.doi and work.id:
+                    pairs.append((work.doi, work.id))
+            works = len(lines)
+        else:
+            works = 0
+            for line in lines:
+                id_match = _ID_RE.search(line)
+                if id_match is None:
+                    continue
+                works += 1
+                doi_match = _DOI_RE.search(line)
+                if doi_match:
+                    doi, openalex_id = doi_match.group(1), id_match.group(1)
+                    if b'\\' in doi or b'\\' in openalex_id:
+                        # JSON escapes (\/, \uXXXX, \") need a real decode
+                        data = orjson.loads(line)
+                        pairs.append((data["doi"], data["id"]))
+                    else:
+                        pairs.append((doi.decode(), openalex_id.decode()))
+        return pairs, works
+    
+    def _extract_pairs_line_by_line(self, lines: List[bytes], first_line_num: int) -> Tuple[List[Tuple[str, str]], int]:
+        """Slow path for a chunk that failed: retry each line on its own, skipping the bad ones.
+        orjson.JSONDecodeError, pydantic's ValidationError and UnicodeDecodeError are all ValueErrors."""
+        pairs = []
+        works = 0
+        for line_num, line in enumerate(lines, first_line_num + 1):
+            try:
+                line_pairs, line_works = self._extract_pairs([line])
+            except (ValueError, TypeError) as e:
+                logger.warning("Error parsing line %d: %s", line_num, e)
+                continue
+            pairs.extend(line_pairs)
+            works += line_works
+        return pairs, works
+    
+    def _batch_writer(self, batch_queue: queue.Queue, stats: PerformanceStats, stats_lock: threading.Lock):
+        """Writer-pool worker: drain batches from the queue until a None sentinel arrives"""
+        while True:
+            updates = batch_queue.get()
+            if updates is None:
+                return
+            
+            batch_start = time.time()
+            failed = 0
+            try:
+                matched = self._process_batch_with_timing(updates)
+            except Exception as e:
+                # Keep draining so the producer never blocks on a dead writer
+                logger.error(f"Batch write failed ({len(updates):,} candidates): {e}")
+                matched = 0
+                failed = 1
+            batch_time = time.time() - batch_start
+            
+            with stats_lock:
+                stats.total_neo4j_matches += matched
+                stats.failed_batches += failed
+                stats.neo4j_matching_time += batch_time
+    
     def _process_batch_with_timing(self, updates: List[Dict[str, str]]) -> int:
         """Process batch with timing"""
         if not updates:
@@ -155,20 +472,24 @@ class PerformanceTestLoader:
         
         start_time = time.time()
         
-        with self.driver.session() as session:
-            result = session.run("""
-                UNWIND $updates AS update
-                MATCH (p:Paper {doi: update.doi})
-                SET p.openalex_id = update.openalex_id
-                RETURN count(p) as matched_papers
-            """, updates=updates)
-            
-            matched = result.single()["matched_papers"]
+        if self.use_apoc:
+            # apoc.periodic.iterate manages its own inner transactions, so run it auto-commit;
+            # failed inner batches raise ApocBatchError instead of counting as matches
+            result = self._get_session().run(self.UPSERT_OPENALEX_ID_APOC, updates=updates)
+            matched = apoc_properties_set(result.single())
+        else:
+            # Managed transaction: the UNWIND is idempotent, so transparent retries are safe.
+            # No rows are streamed back - one property is set per matched paper, so the
+            # summary counters give the match count
+            matched = self._get_session().execute_write(
+                lambda tx: tx.run(self.UPSERT_OPENALEX_ID, updates=updates).consume().counters.properties_set
+            )
             
         processing_time = time.time() - start_time
         
-        if matched > 0:
-            logger.info(f"Batch: {matched:,} matches in {processing_time:.2f}s ({len(updates):,} candidates)")
+        # Slow-batch detector instead of a log line per batch
+        if processing_time > SLOW_BATCH_SECONDS:
+            logger.info("Slow batch: %d matches in %.2fs (%d candidates)", matched, processing_time, len(updates))
         
         return matched
     
@@ -179,13 +500,16 @@ class PerformanceTestLoader:
         logger.info("=" * 80)
         logger.info(f"Total records processed: {stats.total_works_processed:,}")
         logger.info(f"Records with DOI: {stats.total_works_with_doi:,}")
+        logger.info(f"Duplicate DOIs skipped: {stats.duplicate_dois_skipped:,}")
         logger.info(f"Neo4j matches found: {stats.total_neo4j_matches:,}")
+        if stats.failed_batches:
+            logger.warning(f"Failed batches: {stats.failed_batches:,} (their matches are not counted)")
         logger.info(f"File size: {stats.total_data_size_mb:.2f} MB")
         logger.info("")
         logger.info("TIMING BREAKDOWN:")
         logger.info(f"  Total time: {stats.total_processing_time_seconds:.2f} seconds")
         logger.info(f"  JSON parsing: {stats.json_parsing_time:.2f} seconds ({stats.json_parsing_time/stats.total_processing_time_seconds*100:.1f}%)")
-        logger.info(f"  Neo4j operations: {stats.neo4j_matching_time:.2f} seconds ({stats.neo4j_matching_time/stats.total_processing_time_seconds*100:.1f}%)")
+        logger.info(f"  Neo4j operations (summed over writers): {stats.neo4j_matching_time:.2f} seconds ({stats.neo4j_matching_time/stats.total_processing_time_seconds*100:.1f}%)")
         logger.info("")
         logger.info("THROUGHPUT:")
         logger.info(f"  Works per second: {stats.avg_works_per_second:.0f}")
@@ -202,37 +526,60 @@ class PerformanceTestLoader:
         
         logger.info("=" * 80)
     
-    def test_multiple_files(self, max_files: int = 3, max_records_per_file: int = 50000):
-        """Test performance across multiple files"""
-        logger.info(f"Testing performance across {max_files} files, {max_records_per_file:,} records each")
-        
-        files_tested = 0
-        total_stats = PerformanceStats()
+    def test_multiple_files(self, max_files: int = 3, max_records_per_file: Optional[int] = 50000):
+        """Test performance across multiple files (whole files when max_records_per_file is None)"""
+        records_desc = f"{max_records_per_file:,} records each" if max_records_per_file else "all records"
+        logger.info(f"Testing performance across {max_files} files, {records_desc}")
         
+        # First part file of each date directory, up to max_files
+        files = []
         for date_dir in sorted(self.data_dir.iterdir()):
-            if not date_dir.is_dir() or files_tested >= max_files:
+            if not date_dir.is_dir() or len(files) >= max_files:
                 continue
+            part_files = sorted(date_dir.glob("part_*.gz"))
+            if part_files:
+                files.append(part_files[0])
+        
+        total_stats = PerformanceStats()
+        if not files:
+            logger.warning(f"No part files found under {self.data_dir}")
+            return total_stats
+        
+        # Files are independent, so test them in parallel; each worker process builds
+        # its own loader because Neo4j drivers are not fork-safe
+        max_workers = min(os.cpu_count() or 1, 6, len(files))
+        logger.info(f"Testing {len(files)} files with {max_workers} worker processes")
+        start_time = time.time()
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_process_one_file, str(part_file), max_records_per_file,
+                                self._connection, self.validate, self.writer_threads): part_file
+                for part_file in files
+            }
+            
+            for future in as_completed(futures):
+                part_file = futures[future]
+                try:
+                    file_stats = future.result()
+                except Exception as e:
+                    logger.error(f"Error testing {part_file}: {e}")
+                    continue
                 
-            for part_file in sorted(date_dir.glob("part_*.gz")):
-                if files_tested >= max_files:
-                    break
-                    
-                logger.info(f"\n{'='*60}")
-                logger.info(f"Testing file {files_tested + 1}/{max_files}: {part_file.name}")
-                logger.info(f"{'='*60}")
-                
-                file_stats = self.test_single_file_performance(part_file, max_records_per_file)
+                logger.info(f"Finished {part_file.parent.name}/{part_file.name}: "
+                            f"{file_stats.total_works_processed:,} records in {file_stats.total_processing_time_seconds:.2f}s")
                 
                 # Aggregate stats
                 total_stats.total_files_processed += 1
                 total_stats.total_works_processed += file_stats.total_works_processed
                 total_stats.total_works_with_doi += file_stats.total_works_with_doi
                 total_stats.total_neo4j_matches += file_stats.total_neo4j_matches
-                total_stats.total_processing_time_seconds += file_stats.total_processing_time_seconds
+                total_stats.duplicate_dois_skipped += file_stats.duplicate_dois_skipped
+                total_stats.failed_batches += file_stats.failed_batches
                 total_stats.total_data_size_mb += file_stats.total_data_size_mb
-                
-                files_tested += 1
-                break
+        
+        # Files ran concurrently, so throughput is measured against wall-clock time
+        total_stats.total_processing_time_seconds = time.time() - start_time
         
         # Calculate aggregate metrics
         if total_stats.total_processing_time_seconds > 0:
@@ -245,6 +592,8 @@ class PerformanceTestLoader:
         logger.info(f"Files tested: {total_stats.total_files_processed}")
         logger.info(f"Total records: {total_stats.total_works_processed:,}")
         logger.info(f"Total matches: {total_stats.total_neo4j_matches:,}")
+        if total_stats.failed_batches:
+            logger.warning(f"Failed batches: {total_stats.failed_batches:,}")
         logger.info(f"Total data: {total_stats.total_data_size_mb:.2f} MB")
         logger.info(f"Total time: {total_stats.total_processing_time_seconds:.2f} seconds")
         logger.info(f"Average speed: {total_stats.avg_works_per_second:.0f} works/sec, {total_stats.avg_mb_per_second:.2f} MB/sec")
@@ -255,9 +604,21 @@ class PerformanceTestLoader:
         
         return total_stats
 
+def _process_one_file(file_path: str, max_records: Optional[int], connection: tuple,
+                      validate: bool, writer_threads: int) -> PerformanceStats:
+    """Worker-process entry point: test one file with a loader (and driver) of its own"""
+    neo4j_uri, neo4j_user, neo4j_password = connection
+    loader = PerformanceTestLoader(neo4j_uri, neo4j_user, neo4j_password,
+                                   validate=validate, writer_threads=writer_threads)
+    try:
+        return loader.test_single_file_performance(Path(file_path), max_records)
+    finally:
+        loader.close()
+
 def main():
     """Main function for performance testing"""
     import os
+    import sys
     from dotenv import load_dotenv
     
     load_dotenv()
@@ -271,11 +632,21 @@ def main():
         raise ValueError("NEO4J_PASSWORD environment variable is required")
     
     # Create loader and run performance tests
-    loader = PerformanceTestLoader(neo4j_uri, neo4j_user, neo4j_password)
+    # --validate: measure the full parse + Pydantic validation path instead
+    # --writers=N: number of batches kept in flight against Neo4j (default 4)
+    # --full: read whole files; builds (then reuses) the Parquet sidecars and rapidgzip indexes
+    writer_threads = 4
+    for arg in sys.argv[1:]:
+        if arg.startswith("--writers="):
+            writer_threads = int(arg.split("=", 1)[1])
+    
+    loader = PerformanceTestLoader(neo4j_uri, neo4j_user, neo4j_password,
+                                   validate="--validate" in sys.argv, writer_threads=writer_threads)
     
     try:
         # Test multiple files for comprehensive performance analysis
-        loader.test_multiple_files(max_files=3, max_records_per_file=100000)
+        max_records_per_file = None if "--full" in sys.argv else 100000
+        loader.test_multiple_files(max_files=3, max_records_per_file=max_records_per_file)
         
     finally:
         loader.close()
@@ -8,14 +8,23 @@ Provides key statistics about the OpenAlex dataset:
 """
 
 import logging
+import os
 import time
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Tuple
-import gzip
+
+try:
+    from isal import igzip as gzip  # Optional: ISA-L SIMD inflate, API-compatible with gzip
+except ImportError:
+    import gzip
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Decompressed bytes per read when counting records; newlines are counted per block in C
+COUNT_CHUNK_SIZE = 1 << 20
+
 def quick_dataset_summary():
     """Provide quick overview of dataset structure and size"""
     logger.info("🔍 QUICK DATASET SUMMARY")
@@ -23,8 +32,9 @@ def quick_dataset_summary():
     
     data_dir = Path("data/works")
     
-    # Get all directories and their basic info
-    date_dirs = sorted([d for d in data_dir.iterdir() if d.is_dir()])
+    # Get all directories and their basic info (DirEntry caches type info from the listing)
+    with os.scandir(data_dir) as it:
+        date_dirs = sorted((e for e in it if e.is_dir(follow_symlinks=False)), key=attrgetter('name'))
     total_dirs = len(date_dirs)
     
     logger.info(f"📁 Total directories: {total_dirs}")
@@ -37,9 +47,14 @@ def quick_dataset_summary():
     logger.info("📊 Analyzing file structure...")
     
     for date_dir in date_dirs:
-        part_files = list(date_dir.glob("part_*.gz"))
-        dir_files = len(part_files)
-        dir_size_mb = sum(f.stat().st_size for f in part_files) / (1024 * 1024)
+        dir_files = 0
+        dir_size = 0
+        with os.scandir(date_dir.path) as it:
+            for entry in it:
+                if entry.name.startswith("part_") and entry.name.endswith(".gz"):
+                    dir_files += 1
+                    dir_size += entry.stat().st_size
+        dir_size_mb = dir_size / (1024 * 1024)
         
         total_files += dir_files
         total_size_mb += dir_size_mb
@@ -64,17 +79,26 @@ def quick_dataset_summary():
     sampled_size_mb = 0.0
     
     for dir_name, files, size_mb in file_sizes[:5]:  # Sample top 5 directories
-        dir_path = data_dir / dir_name
-        part_files = sorted(dir_path.glob("part_*.gz"))
+        with os.scandir(data_dir / dir_name) as it:
+            part_files = sorted((e for e in it if e.name.startswith("part_") and e.name.endswith(".gz")),
+                                key=attrgetter('name'))
         
         for part_file in part_files:
+            file_size_mb = part_file.stat().st_size / (1024 * 1024)
             try:
-                with gzip.open(part_file, 'rt') as f:
-                    records = sum(1 for _ in f)
+                records = 0
+                last_chunk = b''
+                with gzip.open(part_file, 'rb') as f:
+                    while chunk := f.read(COUNT_CHUNK_SIZE):
+                        records += chunk.count(b'\n')
+                        last_chunk = chunk
+                # A final record without a trailing newline is still a record
+                if last_chunk and not last_chunk.endswith(b'\n'):
+                    records += 1
                 sampled_records += records
-                sampled_size_mb += part_file.stat().st_size / (1024 * 1024)
+                sampled_size_mb += file_size_mb
                 
-                logger.info(f"  📄 {dir_name}/{part_file.name}: {records:,} records ({part_file.stat().st_size / (1024 * 1024):.1f} MB)")
+                logger.info(f"  📄 {dir_name}/{part_file.name}: {records:,} records ({file_size_mb:.1f} MB)")
                 
             except Exception as e:
                 logger.warning(f"  ⚠️ Could not read {part_file.name}: {e}")
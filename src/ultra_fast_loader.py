@@ -8,18 +8,45 @@ Root cause analysis:
 4. Implement smart batching with pre-filtering
 """
 
-import json
 import gzip
+import io
 import logging
+import multiprocessing.util
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Set, List, Optional
+from typing import Set, List, Optional, Iterator, BinaryIO
 from datetime import datetime
 import os
+import orjson
 from neo4j import GraphDatabase
-from pydantic import BaseModel
 
-from data_models.openalex import OpenAlexWork
+from neo4j_apoc import APOC_ITERATE_RETURN, apoc_properties_set, has_apoc_iterate
+
+try:
+    import rapidgzip  # Optional: parallel gzip decompression across cores
+except ImportError:
+    rapidgzip = None
+
+try:
+    from pybloom_live import BloomFilter  # Optional: compact filter of the DOIs in Neo4j
+except ImportError:
+    BloomFilter = None
+
+try:
+    import simdjson  # Optional: On-Demand parsing that only materializes the fields read
+except ImportError:
+    simdjson = None
+
+try:
+    import msgspec  # Optional: typed decode of just id/doi straight from bytes
+except ImportError:
+    msgspec = None
 
 # Configure logging
 logging.basicConfig(
@@ -28,12 +55,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class UltraPerformanceStats(BaseModel):
-    """Performance statistics for ultra loader"""
+# DOI prefixes OpenAlex records may carry; Neo4j stores bare DOIs
+_PREFIX = "https://doi.org/"
+_HTTP_PREFIX = "http://doi.org/"
+_SCHEME_PREFIX = "doi:"
+
+# False-positive rate for the Neo4j DOI filter; a false positive only sends one extra
+# candidate to Neo4j, where the MATCH filters it out
+DOI_FILTER_ERROR_RATE = 0.001
+
+# Filter capacity relative to the DOI count taken just before loading it
+DOI_FILTER_HEADROOM = 1.1
+
+# Writer threads draining parsed batches, and how many batches may wait for them
+WRITER_THREADS = 8
+WRITER_QUEUE_SIZE = 8
+
+# Worker processes for the full run, one file at a time each; every process also runs a
+# parse thread, WRITER_THREADS writers and (with rapidgzip) parallel decompression
+FILE_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+# Read buffer for the stdlib gzip fallback; the 8 KiB default means far more zlib calls per line
+READ_BUFFER_SIZE = 1 << 20
+
+# Decompressed bytes per read; lines are split out of each block in one C call
+READ_CHUNK_SIZE = 1 << 22
+
+# Records per parse chunk; one try/except per chunk, per-line fallback on failure
+RECORD_CHUNK_SIZE = 10000
+
+# What the extractors raise on a malformed record; msgspec's DecodeError is not a ValueError
+PARSE_ERRORS = (ValueError, TypeError, AttributeError) + ((msgspec.DecodeError,) if msgspec is not None else ())
+
+if msgspec is not None:
+    class OpenAlexWorkLite(msgspec.Struct):
+        """The two OpenAlex work fields the loader reads; every other key is skipped while decoding"""
+        id: Optional[str] = None
+        doi: Optional[str] = None
+
+@dataclass(slots=True)
+class UltraPerformanceStats:
+    """Performance statistics for ultra loader (plain slots dataclass - no per-assignment validation)"""
     files_processed: int = 0
     total_works_processed: int = 0
     works_with_doi: int = 0
     neo4j_matches: int = 0
+    duplicate_dois_skipped: int = 0
     processing_time_seconds: float = 0.0
     works_per_second: float = 0.0
     mb_per_second: float = 0.0
@@ -42,7 +109,28 @@ class UltraPerformanceStats(BaseModel):
 class UltraFastLoader:
     """Ultra-optimized loader with minimal database operations"""
     
-    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str):
+    # Single optimized query with minimal overhead. Batches are sent as two parallel lists
+    # ($dois, $oids) rather than a list of maps - no per-row map headers on the wire and no
+    # per-record dict in Python. No RETURN: the match count is read from the summary
+    # counters (one property set per matched paper).
+    # The text is one compile-time constant without indentation padding: every batch sends
+    # exactly the same, shortest string, so Neo4j serves it from its query plan cache
+    _UPDATE_CYPHER = (
+        "UNWIND range(0, size($dois) - 1) AS i "
+        "MATCH (p:Paper {doi: $dois[i]}) "
+        "SET p.openalex_id = $oids[i]"
+    )
+    # With APOC the batch is committed in 1000-row sub-batches on parallel server threads
+    _UPDATE_CYPHER_APOC = (
+        "CALL apoc.periodic.iterate("
+        "'UNWIND range(0, size($dois) - 1) AS i RETURN $dois[i] AS doi, $oids[i] AS oid', "
+        "'MATCH (p:Paper {doi: doi}) SET p.openalex_id = oid', "
+        "{batchSize: 1000, parallel: true, params: {dois: $dois, oids: $oids}}) "
+        + APOC_ITERATE_RETURN
+    )
+    
+    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str,
+                 known_dois=None, decompress_threads: Optional[int] = None):
         # Optimized driver configuration
         self.driver = GraphDatabase.driver(
             neo4j_uri, 
@@ -52,12 +140,46 @@ class UltraFastLoader:
             connection_acquisition_timeout=60
         )
         self.data_dir = Path("data/works")
-        self._prepare_database()
+        # DOIs already sent this run, across files - OpenAlex snapshots repeat records between updates.
+        # Added when a DOI is queued (so repeats within a file are caught before the write) and
+        # removed again if its batch fails
+        self._seen = set()
+        # Writer threads live as long as the loader, each with one session reused for every
+        # batch of every file; sessions are closed in close()
+        self._writers = ThreadPoolExecutor(max_workers=WRITER_THREADS, thread_name_prefix="ultra-writer")
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        # rapidgzip threads per file; worker processes get a share of the cores
+        self.decompress_threads = decompress_threads or os.cpu_count()
+        # Worker processes are handed the DOI filter their parent already loaded
+        if known_dois is None:
+            self._prepare_database()
+        else:
+            self.known_dois = known_dois
+        self.use_apoc = has_apoc_iterate(self.driver)
+        if self.use_apoc:
+            logger.info("APOC detected - using apoc.periodic.iterate for batch updates")
         
     def close(self):
-        """Close Neo4j connection"""
+        """Stop the writer threads, close their sessions and the Neo4j connection"""
+        self._writers.shutdown(wait=True)
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
         self.driver.close()
     
+    def _get_session(self):
+        """Return this thread's write session, opening it on first use"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.driver.session()
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+    
     def _prepare_database(self):
         """Prepare database for ultra-fast operations"""
         logger.info("Preparing database for ultra-fast operations...")
@@ -71,8 +193,49 @@ class UltraFastLoader:
             total_dois = result.single()["total"]
             logger.info(f"Database contains {total_dois:,} papers with DOIs")
             
+        self.known_dois = self._load_known_dois(total_dois)
         logger.info("Database prepared")
     
+    def _load_known_dois(self, total_dois: int, page_size: int = 500000):
+        """Load every Neo4j DOI into a Bloom filter (exact set if pybloom_live is missing).
+        
+        Most OpenAlex DOIs are not in the graph, so candidates are checked here
+        first and only likely hits are sent to Neo4j. DOIs are paged in index
+        order (keyset pagination on p.doi) so the server never materializes
+        the full result.
+        """
+        logger.info("Loading Neo4j DOIs into the pre-filter...")
+        start_time = time.time()
+        
+        if BloomFilter is not None:
+            # Headroom for papers added after the count; pybloom_live raises once it's full
+            known_dois = BloomFilter(capacity=max(int(total_dois * DOI_FILTER_HEADROOM), 1),
+                                     error_rate=DOI_FILTER_ERROR_RATE)
+        else:
+            known_dois = set()
+        
+        last_doi = ""
+        with self.driver.session(fetch_size=50000) as session:
+            while True:
+                # `p.doi > ''` also excludes NULL and empty DOIs
+                result = session.run("""
+                    MATCH (p:Paper)
+                    WHERE p.doi > $after
+                    RETURN p.doi AS doi
+                    ORDER BY p.doi
+                    LIMIT $page_size
+                """, after=last_doi, page_size=page_size)
+                
+                page = [record["doi"] for record in result]
+                for doi in page:
+                    known_dois.add(doi)
+                if len(page) < page_size:
+                    break
+                last_doi = page[-1]
+        
+        logger.info(f"Loaded {len(known_dois):,} DOIs into the pre-filter in {time.time() - start_time:.1f}s")
+        return known_dois
+    
     def process_file_ultra_fast(self, file_path: Path, max_records: int = None, batch_size: int = 20000) -> UltraPerformanceStats:
         """Process file with ultra-fast optimizations"""
         logger.info(f"Processing {file_path.name} - ULTRA-FAST MODE (batch={batch_size})")
@@ -83,53 +246,90 @@ class UltraFastLoader:
         # Get file size
         file_size_mb = file_path.stat().st_size / (1024 * 1024)
         
-        update_batch = []
+        # Per-record counters stay local and are copied into stats once the file is done;
+        # neo4j_matches is updated by the writer threads under stats_lock
+        total_works = 0
+        works_with_doi = 0
+        duplicates_skipped = 0
+        # Pre-sized batch lists filled by index - no append-driven regrowth. A full batch
+        # belongs to the writer that takes it, so each flush starts new lists
+        batch_dois = [None] * batch_size
+        batch_oids = [None] * batch_size
+        batch_len = 0
+        extract_doi_id = _make_doi_id_extractor()
+        
+        # This thread decompresses and parses while the writer threads talk to Neo4j;
+        # the bounded queue keeps parsed batches from piling up in memory
+        batch_queue = queue.Queue(maxsize=WRITER_QUEUE_SIZE)
+        stats_lock = threading.Lock()
+        writers = [self._writers.submit(self._batch_writer, batch_queue, stats, stats_lock)
+                   for _ in range(WRITER_THREADS)]
         
         try:
-            with gzip.open(file_path, 'rt') as f:
-                for line_num, line in enumerate(f, 1):
-                    if max_records and line_num > max_records:
+            with open_part_file(file_path, self.decompress_threads) as f:
+                lines = iter_lines(f)
+                line_num = 0
+                while True:
+                    chunk_size = RECORD_CHUNK_SIZE if not max_records else min(RECORD_CHUNK_SIZE, max_records - line_num)
+                    chunk = list(islice(lines, chunk_size))
+                    if not chunk:
                         break
                     
+                    # One try per chunk instead of per record; a chunk with a bad
+                    # record is redone line by line to skip just that record
                     try:
-                        data = json.loads(line.strip())
-                        work = OpenAlexWork(**data)
-                        stats.total_works_processed += 1
-                        
-                        if work.doi and work.id:
-                            stats.works_with_doi += 1
-                            clean_doi = work.doi.replace("https://doi.org/", "")
-                            
-                            update_batch.append({
-                                'doi': clean_doi,
-                                'openalex_id': work.id
-                            })
+                        # Only doi and id are used - no full OpenAlexWork validation per record
+                        pairs = [extract_doi_id(line) for line in chunk]
+                    except PARSE_ERRORS:
+                        pairs = _extract_doi_ids_line_by_line(chunk, extract_doi_id)
+                    
+                    line_num += len(chunk)
+                    total_works += len(pairs)
+                    
+                    for doi, oid in pairs:
+                        if doi and oid:
+                            works_with_doi += 1
+                            clean_doi = doi.removeprefix(_PREFIX).removeprefix(_HTTP_PREFIX).removeprefix(_SCHEME_PREFIX)
                             
-                            # Process large batches to minimize database round-trips
-                            if len(update_batch) >= batch_size:
-                                matched = self._process_batch_ultra_fast(update_batch)
-                                stats.neo4j_matches += matched
-                                update_batch = []
+                            # Only DOIs (probably) present in Neo4j are worth a lookup, and only once
+                            if clean_doi in self._seen:
+                                duplicates_skipped += 1
+                            elif clean_doi in self.known_dois:
+                                self._seen.add(clean_doi)
+                                batch_dois[batch_len] = clean_doi
+                                batch_oids[batch_len] = oid
+                                batch_len += 1
+                                
+                                # Hand large batches to the writers to minimize database round-trips
+                                if batch_len == batch_size:
+                                    batch_queue.put((batch_dois, batch_oids))
+                                    batch_dois = [None] * batch_size
+                                    batch_oids = [None] * batch_size
+                                    batch_len = 0
+                    
+                    # Less frequent progress logging
+                    if line_num % 200000 == 0:
+                        elapsed = time.time() - start_time
+                        works_per_sec = total_works / elapsed if elapsed > 0 else 0
                         
-                        # Less frequent progress logging
-                        if line_num % 200000 == 0:
-                            elapsed = time.time() - start_time
-                            works_per_sec = stats.total_works_processed / elapsed if elapsed > 0 else 0
-                            
-                            logger.info(f"Progress: {line_num:,} processed, {works_per_sec:.0f} works/sec, {stats.neo4j_matches:,} matches")
-                            
-                    except Exception as e:
-                        continue  # Skip bad records silently for speed
+                        logger.info(f"Progress: {line_num:,} processed, {works_per_sec:.0f} works/sec, {stats.neo4j_matches:,} matches")
                 
                 # Process remaining batch
-                if update_batch:
-                    matched = self._process_batch_ultra_fast(update_batch)
-                    stats.neo4j_matches += matched
+                if batch_len:
+                    batch_queue.put((batch_dois[:batch_len], batch_oids[:batch_len]))
                 
         except Exception as e:
             logger.error(f"Error processing file {file_path}: {e}")
+        finally:
+            # One sentinel per writer, then wait for queued batches to be written
+            for _ in range(WRITER_THREADS):
+                batch_queue.put(None)
+            wait(writers)
             
         # Calculate final statistics
+        stats.total_works_processed = total_works
+        stats.works_with_doi = works_with_doi
+        stats.duplicate_dois_skipped = duplicates_skipped
         end_time = time.time()
         stats.processing_time_seconds = end_time - start_time
         stats.data_processed_mb = file_size_mb * (stats.total_works_processed / max_records if max_records else 1.0)
@@ -143,34 +343,53 @@ class UltraFastLoader:
         self._log_ultra_summary(stats, file_path, max_records)
         return stats
     
-    def _process_batch_ultra_fast(self, updates: List[Dict[str, str]]) -> int:
-        """Process batch with ultra-fast optimizations"""
-        if not updates:
+    def _batch_writer(self, batch_queue: queue.Queue, stats: UltraPerformanceStats, stats_lock: threading.Lock):
+        """Writer thread: write batches from the queue until a None sentinel arrives.
+        Every batch goes through the thread's own long-lived session."""
+        session = self._get_session()
+        while True:
+            batch = batch_queue.get()
+            if batch is None:
+                return
+            
+            matched = self._process_batch_ultra_fast(session, *batch)
+            with stats_lock:
+                stats.neo4j_matches += matched
+    
+    def _process_batch_ultra_fast(self, session, dois: List[str], oids: List[str]) -> int:
+        """Process batch with ultra-fast optimizations (dois[i] gets openalex_id oids[i])"""
+        if not dois:
             return 0
         
         start_time = time.time()
         
+        # DOI order walks the paper_doi_index B-tree leaf by leaf instead of jumping
+        # around it; the pairs are sorted together so each DOI keeps its id
+        dois, oids = map(list, zip(*sorted(zip(dois, oids))))
+        
         try:
-            with self.driver.session() as session:
-                # Single optimized query with minimal overhead
-                result = session.run("""
-                    UNWIND $updates AS update
-                    MATCH (p:Paper {doi: update.doi})
-                    SET p.openalex_id = update.openalex_id
-                    RETURN count(p) as matched_papers
-                """, updates=updates)
-                
-                matched = result.single()["matched_papers"]
-                
+            if self.use_apoc:
+                # apoc.periodic.iterate manages its own inner transactions, so run it auto-commit;
+                # failed inner batches raise ApocBatchError and are rolled back below
+                matched = apoc_properties_set(session.run(self._UPDATE_CYPHER_APOC, dois=dois, oids=oids).single())
+            else:
+                # Explicit write transaction: retried by the driver on transient errors
+                matched = session.execute_write(
+                    lambda tx: tx.run(self._UPDATE_CYPHER, dois=dois, oids=oids).consume().counters.properties_set
+                )
+            
         except Exception as e:
             logger.error(f"Batch processing error: {e}")
+            # The parser marked these DOIs as sent when it queued them; forget them so a
+            # later occurrence (this run or another file) is retried
+            self._seen.difference_update(dois)
             return 0
             
         processing_time = time.time() - start_time
         
         if matched > 0:
-            rate = len(updates) / processing_time if processing_time > 0 else 0
-            logger.debug(f"Ultra batch: {matched:,} matches from {len(updates):,} candidates in {processing_time:.2f}s ({rate:.0f} ops/sec)")
+            rate = len(dois) / processing_time if processing_time > 0 else 0
+            logger.debug(f"Ultra batch: {matched:,} matches from {len(dois):,} candidates in {processing_time:.2f}s ({rate:.0f} ops/sec)")
         
         return matched
     
@@ -182,6 +401,7 @@ class UltraFastLoader:
         logger.info(f"Records processed: {stats.total_works_processed:,}")
         logger.info(f"Works with DOI: {stats.works_with_doi:,}")
         logger.info(f"Neo4j matches: {stats.neo4j_matches:,}")
+        logger.info(f"Duplicate DOIs skipped: {stats.duplicate_dois_skipped:,}")
         logger.info(f"Match rate: {stats.neo4j_matches/stats.works_with_doi*100 if stats.works_with_doi > 0 else 0:.3f}%")
         logger.info(f"Processing time: {stats.processing_time_seconds:.2f} seconds")
         logger.info(f"⚡ ULTRA Throughput: {stats.works_per_second:.0f} works/sec, {stats.mb_per_second:.2f} MB/sec")
@@ -205,6 +425,126 @@ class UltraFastLoader:
         
         logger.info("=" * 80)
 
+@contextmanager
+def open_part_file(file_path: Path, parallelization: Optional[int] = None) -> Iterator[BinaryIO]:
+    """Open a part file as a binary stream, decoding DEFLATE blocks on `parallelization` threads
+    (default: all cores) when rapidgzip is installed.
+    """
+    if rapidgzip is not None:
+        with rapidgzip.open(str(file_path), parallelization=parallelization or os.cpu_count()) as raw:
+            yield io.BufferedReader(raw)
+        return
+    
+    with io.BufferedReader(gzip.open(file_path, 'rb'), buffer_size=READ_BUFFER_SIZE) as f:
+        yield f
+
+def iter_lines(f: BinaryIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the non-empty lines of a binary stream, read in large blocks and split with bytes.split"""
+    tail = b""
+    while chunk := f.read(chunk_size):
+        lines = (tail + chunk).split(b"\n")
+        # The last piece may be a partial line; carry it into the next block
+        tail = lines.pop()
+        yield from filter(None, lines)
+    if tail:
+        yield tail
+
+def _scan_doi_id(line: bytes):
+    """Pull `(doi, id)` straight out of a compact OpenAlex work line without parsing it.
+    
+    Only lines shaped like `{"id":"...","doi":...}` - `id` then `doi` as the first two
+    top-level keys, the record closed with `}` - are scanned. Anything else (other key
+    order, spaced separators, escaped characters, truncated lines) returns None and
+    needs a real JSON parse.
+    """
+    if not line.startswith(b'{"id":"') or not line.endswith(b'}'):
+        return None
+    
+    id_end = line.find(b'"', 7)
+    if id_end < 0 or not line.startswith(b',"doi":', id_end + 1):
+        return None
+    id_bytes = line[7:id_end]
+    if b'\\' in id_bytes:
+        return None
+    
+    doi_start = id_end + 8
+    if line.startswith(b'null', doi_start):
+        doi = None
+    elif line.startswith(b'"', doi_start):
+        doi_end = line.find(b'"', doi_start + 1)
+        if doi_end < 0:
+            return None
+        doi_bytes = line[doi_start + 1:doi_end]
+        if b'\\' in doi_bytes:
+            return None
+        doi = doi_bytes.decode()
+    else:
+        return None
+    
+    return doi, id_bytes.decode()
+
+def _extract_doi_ids_line_by_line(lines: List[bytes], extract_doi_id) -> List[tuple]:
+    """Slow path for a chunk that failed to parse: skip malformed records silently"""
+    pairs = []
+    for line in lines:
+        try:
+            pairs.append(extract_doi_id(line))
+        except PARSE_ERRORS:
+            continue
+    return pairs
+
+def _make_doi_id_extractor():
+    """Return a `line -> (doi, id)` function.
+    
+    Lines go through `_scan_doi_id` first; anything it can't handle falls back to a real
+    parse: msgspec decoding into `OpenAlexWorkLite` (JSON parse and struct build in one C
+    pass), else simdjson On-Demand, else orjson. The simdjson parser reuses its buffers,
+    so make one extractor per thread. The parsed document proxy is dropped when the
+    function returns, which frees the parser for the next line.
+    """
+    if msgspec is not None:
+        decoder = msgspec.json.Decoder(OpenAlexWorkLite)
+        
+        def parse_doi_id(line: bytes):
+            work = decoder.decode(line)
+            return work.doi, work.id
+    elif simdjson is not None:
+        parser = simdjson.Parser()
+        
+        def parse_doi_id(line: bytes):
+            doc = parser.parse(line)
+            return doc.get("doi"), doc.get("id")
+    else:
+        def parse_doi_id(line: bytes):
+            data = orjson.loads(line)
+            return data.get("doi"), data.get("id")
+    
+    def extract_doi_id(line: bytes):
+        found = _scan_doi_id(line)
+        return found if found is not None else parse_doi_id(line)
+    
+    return extract_doi_id
+
+# Set in each worker process by _init_worker
+_worker_loader = None
+
+def _init_worker(connection: tuple, known_dois, decompress_threads: int):
+    """Worker-process initializer: build the process's loader once, for all of its files.
+    
+    The Neo4j driver can't be shared across processes, so each process opens its own; the
+    DOI filter loaded by the parent is reused as is. The loader is closed by a
+    multiprocessing finalizer when the worker process exits.
+    """
+    global _worker_loader
+    neo4j_uri, neo4j_user, neo4j_password = connection
+    _worker_loader = UltraFastLoader(neo4j_uri, neo4j_user, neo4j_password,
+                                     known_dois=known_dois, decompress_threads=decompress_threads)
+    multiprocessing.util.Finalize(_worker_loader, _worker_loader.close, exitpriority=10)
+
+def _process_file_worker(file_path: str, batch_size: int) -> UltraPerformanceStats:
+    """Worker-process entry point: process one file with this process's loader"""
+    return _worker_loader.process_file_ultra_fast(Path(file_path), max_records=None, batch_size=batch_size)
+
 def main():
     """Ultra-fast emergency loader"""
     import sys
@@ -239,47 +579,58 @@ def main():
     if response.lower() not in ['yes', 'y']:
         return
     
+    # The index and DOI filter are prepared once here; worker processes receive the filter
+    # through the pool initializer instead of each paging every DOI out of Neo4j again
     loader = UltraFastLoader(neo4j_uri, neo4j_user, neo4j_password)
+    known_dois = loader.known_dois
+    loader.close()
     
-    try:
+    # Files are independent, so each worker process runs its own loader (driver, parse
+    # thread and writer pool) over a share of them, with a share of the cores for rapidgzip
+    decompress_threads = max(1, (os.cpu_count() or 1) // FILE_WORKERS)
+    date_dirs = sorted([d for d in Path("data/works").iterdir() if d.is_dir()])
+    part_files = [part_file for date_dir in date_dirs for part_file in sorted(date_dir.glob("part_*.gz"))]
+    logger.info(f"Processing {len(part_files)} files from {len(date_dirs)} directories with {FILE_WORKERS} worker processes...")
+    
+    total_stats = UltraPerformanceStats()
+    start_time = time.time()
+    
+    with ProcessPoolExecutor(max_workers=FILE_WORKERS, initializer=_init_worker,
+                             initargs=((neo4j_uri, neo4j_user, neo4j_password), known_dois, decompress_threads)) as executor:
         # Process with large batches for maximum speed
-        total_stats = UltraPerformanceStats()
-        start_time = time.time()
+        futures = {executor.submit(_process_file_worker, str(part_file), 20000): part_file
+                   for part_file in part_files}
         
-        date_dirs = sorted([d for d in Path("data/works").iterdir() if d.is_dir()])
-        logger.info(f"Processing {len(date_dirs)} directories...")
-        
-        for dir_num, date_dir in enumerate(date_dirs, 1):
-            part_files = sorted(date_dir.glob("part_*.gz"))
-            logger.info(f"\nDirectory {dir_num}/{len(date_dirs)}: {date_dir.name} ({len(part_files)} files)")
+        for file_num, future in enumerate(as_completed(futures), 1):
+            part_file = futures[future]
+            try:
+                file_stats = future.result()
+            except Exception as e:
+                logger.error(f"Worker failed on {part_file}: {e}")
+                continue
             
-            for file_num, part_file in enumerate(part_files, 1):
-                logger.info(f"File {file_num}/{len(part_files)}: {part_file.name}")
-                
-                file_stats = loader.process_file_ultra_fast(part_file, max_records=None, batch_size=20000)
-                
-                # Aggregate stats
-                total_stats.files_processed += 1
-                total_stats.total_works_processed += file_stats.total_works_processed
-                total_stats.works_with_doi += file_stats.works_with_doi
-                total_stats.neo4j_matches += file_stats.neo4j_matches
-                total_stats.data_processed_mb += file_stats.data_processed_mb
-                
-                elapsed = time.time() - start_time
-                total_stats.processing_time_seconds = elapsed
-                if elapsed > 0:
-                    total_stats.mb_per_second = total_stats.data_processed_mb / elapsed
-                
-                # Show progress
-                if total_stats.mb_per_second > 0:
-                    remaining_mb = (350 * 1024) - total_stats.data_processed_mb
-                    remaining_hours = remaining_mb / total_stats.mb_per_second / 3600
-                    logger.info(f"⚡ PROGRESS: {total_stats.data_processed_mb:.1f} MB processed, ~{remaining_hours:.1f}h remaining")
-        
-        logger.info("\n🎉 ULTRA-FAST PROCESSING COMPLETE!")
-        
-    finally:
-        loader.close()
+            logger.info(f"File {file_num}/{len(part_files)} done: {part_file.parent.name}/{part_file.name}")
+            
+            # Aggregate stats
+            total_stats.files_processed += 1
+            total_stats.total_works_processed += file_stats.total_works_processed
+            total_stats.works_with_doi += file_stats.works_with_doi
+            total_stats.neo4j_matches += file_stats.neo4j_matches
+            total_stats.duplicate_dois_skipped += file_stats.duplicate_dois_skipped
+            total_stats.data_processed_mb += file_stats.data_processed_mb
+            
+            elapsed = time.time() - start_time
+            total_stats.processing_time_seconds = elapsed
+            if elapsed > 0:
+                total_stats.mb_per_second = total_stats.data_processed_mb / elapsed
+            
+            # Show progress
+            if total_stats.mb_per_second > 0:
+                remaining_mb = (350 * 1024) - total_stats.data_processed_mb
+                remaining_hours = remaining_mb / total_stats.mb_per_second / 3600
+                logger.info(f"⚡ PROGRESS: {total_stats.data_processed_mb:.1f} MB processed, ~{remaining_hours:.1f}h remaining")
+    
+    logger.info("\n🎉 ULTRA-FAST PROCESSING COMPLETE!")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
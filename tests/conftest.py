@@ -0,0 +1,97 @@
+"""Shared fixtures: an in-memory stand-in for the Neo4j driver"""
+
+import re
+from types import SimpleNamespace
+
+import neo4j
+import pytest
+
+
+class FakeResult:
+    """Just enough of neo4j.Result for the loaders: single(), consume() and iteration"""
+
+    def __init__(self, record=None, properties_set=0, rows=()):
+        self._record = record
+        self._properties_set = properties_set
+        self._rows = list(rows)
+
+    def single(self):
+        return self._record
+
+    def consume(self):
+        return SimpleNamespace(counters=SimpleNamespace(properties_set=self._properties_set))
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class FakeSession:
+    """Session and transaction in one: run() answers from the driver, execute_* call straight through"""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def run(self, query, **params):
+        text = getattr(query, "text", query)
+        self._driver.queries.append(text)
+        return self._driver.respond(text, params)
+
+    def execute_write(self, work):
+        return work(self)
+
+    execute_read = execute_write
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FakeDriver:
+    """Every candidate DOI exists in the graph; APOC calls can report failed inner batches"""
+
+    def __init__(self, apoc: bool = False, failed_batches: int = 0):
+        self.apoc = apoc
+        self.failed_batches = failed_batches
+        self.queries = []
+        self.session_options = []
+
+    def session(self, **kwargs):
+        self.session_options.append(kwargs)
+        return FakeSession(self)
+
+    def close(self):
+        pass
+
+    def respond(self, text: str, params: dict) -> FakeResult:
+        if "SHOW PROCEDURES" in text:
+            return FakeResult({"found": int(self.apoc)})
+
+        candidates = params.get("updates") or params.get("dois") or []
+        if "apoc.periodic.iterate" in text:
+            # The properties-set column is named by the query's own RETURN alias
+            failed = self.failed_batches
+            alias = re.findall(r"updateStatistics\.propertiesSet AS (\w+)", text)[-1]
+            return FakeResult({
+                "batches": max(failed, 1),
+                "failedBatches": failed,
+                "errorMessages": {"DeadlockDetected": failed} if failed else {},
+                alias: 0 if failed else len(candidates),
+            })
+        if "count(" in text:
+            return FakeResult({key: 0 for key in ("total", "total_with_doi", "already_matched")})
+        return FakeResult(properties_set=len(candidates), rows=[{"u": u} for u in candidates])
+
+
+@pytest.fixture
+def fake_driver(monkeypatch):
+    """Factory: FakeDriver(**options), installed as what GraphDatabase.driver() returns"""
+    def install(**options):
+        driver = FakeDriver(**options)
+        monkeypatch.setattr(neo4j.GraphDatabase, "driver", lambda *args, **kwargs: driver)
+        return driver
+    return install
@@ -0,0 +1,49 @@
+"""Tests for the OAI-PMH client's response parsing"""
+
+from oai_pmh_client import OAIPMHClient
+
+OAI_HEAD = b'<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">'
+
+
+def _client(monkeypatch, body: bytes) -> OAIPMHClient:
+    """A client whose every request answers with the given OAI-PMH document"""
+    client = OAIPMHClient()
+    root = client._parse_response(OAI_HEAD + body + b'</OAI-PMH>')
+    monkeypatch.setattr(client, "_make_request", lambda params: root)
+    monkeypatch.setattr(client, "_make_cached_request", lambda verb: root)
+    return client
+
+
+def test_identify_skips_comments_and_processing_instructions(monkeypatch):
+    client = _client(monkeypatch, b'<Identify><!-- mirror --><repositoryName>arXiv</repositoryName>'
+                                  b'<?build 42?><protocolVersion>2.0</protocolVersion></Identify>')
+    assert client.identify() == {'repositoryName': 'arXiv', 'protocolVersion': '2.0'}
+
+
+def test_list_metadata_formats_and_sets_skip_comments(monkeypatch):
+    client = _client(monkeypatch, b'<ListMetadataFormats><metadataFormat><!-- dc -->'
+                                  b'<metadataPrefix>oai_dc</metadataPrefix></metadataFormat>'
+                                  b'</ListMetadataFormats>'
+                                  b'<ListSets><set><setSpec>cs</setSpec><!-- x --><setName>CS</setName></set>'
+                                  b'</ListSets>')
+    assert client.list_metadata_formats() == [{'metadataPrefix': 'oai_dc'}]
+    assert client.list_sets() == [{'setSpec': 'cs', 'setName': 'CS'}]
+
+
+def test_record_with_missing_header_fields_parses(monkeypatch):
+    """Missing header fields come back as None instead of failing the record"""
+    client = _client(monkeypatch, b'<ListRecords>'
+                                  b'<record><header status="deleted"><identifier>oai:arXiv.org:1</identifier>'
+                                  b'</header></record>'
+                                  b'<record><header><datestamp>2024-01-01</datestamp></header><metadata>'
+                                  b'<oai_dc:dc xmlns:oai_dc="http://www.openarchives.org/OAI/2.0/oai_dc/" '
+                                  b'xmlns:dc="http://purl.org/dc/elements/1.1/"><dc:title>T</dc:title></oai_dc:dc>'
+                                  b'</metadata></record>'
+                                  b'</ListRecords>')
+    records, token = client.list_records()
+    assert token is None
+    assert records[0] == {'identifier': 'oai:arXiv.org:1', 'datestamp': None, 'status': 'deleted'}
+    assert records[1]['identifier'] is None
+    assert records[1]['datestamp'] == '2024-01-01'
+    assert records[1]['title'] == 'T'
+    assert 'arxiv_id' not in records[1]
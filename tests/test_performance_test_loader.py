@@ -0,0 +1,104 @@
+"""Tests for the performance test loader: gzip reading and APOC batch writes"""
+
+import gzip
+import queue
+import threading
+
+import pytest
+
+import performance_test_loader
+from performance_test_loader import open_gzip_lines
+
+
+def _write_part_file(path, records: int):
+    lines = [b'{"id":"https://openalex.org/W%d","doi":"https://doi.org/10.1/%d"}' % (i, i)
+             for i in range(records)]
+    path.write_bytes(gzip.compress(b"\n".join(lines) + b"\n"))
+    return lines
+
+
+def test_open_gzip_lines_with_rapidgzip(tmp_path):
+    """The rapidgzip path reads every line and persists a seek index it can reuse"""
+    pytest.importorskip("rapidgzip")
+    assert performance_test_loader.rapidgzip is not None
+    
+    part_file = tmp_path / "part_000.gz"
+    expected = _write_part_file(part_file, 50000)
+    
+    with open_gzip_lines(part_file, export_index=True) as lines:
+        assert [line.rstrip(b"\n") for line in lines] == expected
+    assert (tmp_path / "part_000.gz.rgzidx").exists()
+    
+    # Second pass imports the exported index
+    with open_gzip_lines(part_file) as lines:
+        assert [line.rstrip(b"\n") for line in lines] == expected
+
+
+def test_open_gzip_lines_without_rapidgzip(tmp_path, monkeypatch):
+    """The zlib fallback yields the same records"""
+    monkeypatch.setattr(performance_test_loader, "rapidgzip", None)
+    part_file = tmp_path / "part_000.gz"
+    expected = _write_part_file(part_file, 1000)
+    
+    with open_gzip_lines(part_file) as lines:
+        assert list(lines) == expected
+
+
+def _write_batches(loader, batches):
+    stats = performance_test_loader.PerformanceStats()
+    batch_queue = queue.Queue()
+    for updates in batches + [None]:
+        batch_queue.put(updates)
+    loader._batch_writer(batch_queue, stats, threading.Lock())
+    return stats
+
+
+def test_failed_apoc_batch_is_reported(fake_driver):
+    """Failed apoc.periodic.iterate inner batches are counted as failed, not as matches"""
+    fake_driver(apoc=True, failed_batches=1)
+    loader = performance_test_loader.PerformanceTestLoader("bolt://fake", "neo4j", "pw")
+    assert loader.use_apoc
+    
+    updates = [{"doi": "10.1/1", "openalex_id": "W1"}, {"doi": "10.1/2", "openalex_id": "W2"}]
+    stats = _write_batches(loader, [updates, updates])
+    assert stats.total_neo4j_matches == 0
+    assert stats.failed_batches == 2
+
+
+def test_apoc_batch_counts_matches(fake_driver):
+    fake_driver(apoc=True)
+    loader = performance_test_loader.PerformanceTestLoader("bolt://fake", "neo4j", "pw")
+    
+    updates = [{"doi": "10.1/1", "openalex_id": "W1"}, {"doi": "10.1/2", "openalex_id": "W2"}]
+    stats = _write_batches(loader, [updates])
+    assert stats.total_neo4j_matches == 2
+    assert stats.failed_batches == 0
+
+
+def test_sessions_use_configured_database(fake_driver, monkeypatch):
+    """Index setup, the APOC check and batch writes all target NEO4J_DATABASE"""
+    monkeypatch.setenv("NEO4J_DATABASE", "openalex")
+    driver = fake_driver()
+    loader = performance_test_loader.PerformanceTestLoader("bolt://fake", "neo4j", "pw")
+    _write_batches(loader, [[{"doi": "10.1/1", "openalex_id": "W1"}]])
+    
+    assert driver.session_options
+    assert all(options.get("database") == "openalex" for options in driver.session_options)
+
+
+def test_only_lines_with_a_work_id_count_as_works(fake_driver, tmp_path):
+    """Blank and non-JSON lines are skipped without inflating the processed-works count"""
+    fake_driver()
+    loader = performance_test_loader.PerformanceTestLoader("bolt://fake", "neo4j", "pw")
+    part_file = tmp_path / "part_000.gz"
+    part_file.write_bytes(gzip.compress(
+        b'{"id":"https://openalex.org/W1","doi":"https://doi.org/10.1/1"}\n'
+        b'\n'
+        b'not json\n'
+        b'{"id":"https://openalex.org/W2","doi":null}\n'
+    ))
+    
+    stats = loader.test_single_file_performance(part_file, max_records=100)
+    assert stats.total_works_processed == 2
+    assert stats.total_works_with_doi == 1
+    assert stats.total_neo4j_matches == 1
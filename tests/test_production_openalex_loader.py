@@ -0,0 +1,85 @@
+"""Tests for the production loader's Neo4j batch writes and checkpointing"""
+
+import gzip
+
+import production_openalex_loader
+from production_openalex_loader import ProductionOpenAlexLoader
+
+CONNECTION = ("bolt://localhost:7687", "neo4j", "password")
+
+
+def test_apoc_batch_with_failed_inner_batches_is_an_error(fake_driver):
+    """apoc.periodic.iterate reports failed inner batches instead of raising; the batch must fail"""
+    driver = fake_driver(apoc=True, failed_batches=1)
+    loader = ProductionOpenAlexLoader(*CONNECTION, prepare_database=False)
+    assert loader.use_apoc
+    
+    with driver.session() as session:
+        assert loader._process_batch_production(session, [("10.1/a", "https://openalex.org/W1")]) is None
+
+
+def test_apoc_batch_counts_properties_set(fake_driver):
+    driver = fake_driver(apoc=True)
+    loader = ProductionOpenAlexLoader(*CONNECTION, prepare_database=False)
+    
+    with driver.session() as session:
+        batch = [("10.1/a", "https://openalex.org/W1"), ("10.1/b", "https://openalex.org/W2")]
+        assert loader._process_batch_production(session, batch) == 2
+
+
+def _write_part_file(path, records: int):
+    lines = [b'{"id":"https://openalex.org/W%d","doi":"https://doi.org/10.1/%d"}' % (i, i)
+             for i in range(records)]
+    path.write_bytes(gzip.compress(b"\n".join(lines) + b"\n"))
+
+
+def _checkpointed_paths(checkpoint):
+    return [row[0] for row in checkpoint.execute("SELECT path FROM done")]
+
+
+def test_file_with_failed_apoc_batches_is_not_checkpointed(fake_driver, tmp_path, monkeypatch):
+    """A file whose APOC inner batches failed must be retried, not marked done"""
+    monkeypatch.chdir(tmp_path)
+    fake_driver(apoc=True, failed_batches=1)
+    loader = ProductionOpenAlexLoader(*CONNECTION, prepare_database=False)
+    part_file = tmp_path / "part_000.gz"
+    _write_part_file(part_file, 1000)
+    
+    file_stats = loader.process_file_production(part_file, batch_size=400)
+    assert file_stats.errors > 0
+    
+    checkpoint = loader._open_checkpoint()
+    assert not loader._checkpoint_file(checkpoint, part_file, file_stats)
+    assert _checkpointed_paths(checkpoint) == []
+
+
+def test_file_with_successful_batches_is_checkpointed(fake_driver, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fake_driver(apoc=True)
+    loader = ProductionOpenAlexLoader(*CONNECTION, prepare_database=False)
+    part_file = tmp_path / "part_000.gz"
+    _write_part_file(part_file, 1000)
+    
+    file_stats = loader.process_file_production(part_file, batch_size=400)
+    assert file_stats.errors == 0
+    assert file_stats.neo4j_matches == 1000
+    
+    checkpoint = loader._open_checkpoint()
+    assert loader._checkpoint_file(checkpoint, part_file, file_stats)
+    assert _checkpointed_paths(checkpoint) == [str(part_file)]
+
+
+def test_worker_process_reuses_one_loader(fake_driver, tmp_path, monkeypatch):
+    """The pool initializer builds the loader (and checks for APOC) once for all of a worker's files"""
+    monkeypatch.setattr(production_openalex_loader, "_worker_loader", None)
+    driver = fake_driver(apoc=True)
+    production_openalex_loader._init_worker(CONNECTION, None, None)
+    loader = production_openalex_loader._worker_loader
+    
+    for name in ("part_000.gz", "part_001.gz"):
+        _write_part_file(tmp_path / name, 100)
+        file_stats = production_openalex_loader._process_file_worker(str(tmp_path / name), 400)
+        assert file_stats.neo4j_matches == 100
+    
+    assert production_openalex_loader._worker_loader is loader
+    assert sum("SHOW PROCEDURES" in query for query in driver.queries) == 1
@@ -0,0 +1,79 @@
+"""Tests for the ultra-fast loader: part-file reading and APOC batch writes"""
+
+import gzip
+
+import pytest
+
+import ultra_fast_loader
+from ultra_fast_loader import iter_lines, open_part_file
+
+
+def _write_part_file(path, records: int):
+    lines = [b'{"id":"https://openalex.org/W%d","doi":"https://doi.org/10.1/%d"}' % (i, i)
+             for i in range(records)]
+    path.write_bytes(gzip.compress(b"\n".join(lines) + b"\n"))
+    return lines
+
+
+def test_open_part_file_with_rapidgzip(tmp_path):
+    """The rapidgzip path decodes every record of a real part file"""
+    pytest.importorskip("rapidgzip")
+    assert ultra_fast_loader.rapidgzip is not None
+    
+    part_file = tmp_path / "part_000.gz"
+    expected = _write_part_file(part_file, 50000)
+    
+    with open_part_file(part_file, parallelization=2) as f:
+        assert list(iter_lines(f)) == expected
+
+
+def test_open_part_file_without_rapidgzip(tmp_path, monkeypatch):
+    """The stdlib gzip fallback yields the same records"""
+    monkeypatch.setattr(ultra_fast_loader, "rapidgzip", None)
+    part_file = tmp_path / "part_000.gz"
+    expected = _write_part_file(part_file, 1000)
+    
+    with open_part_file(part_file) as f:
+        assert list(iter_lines(f)) == expected
+
+
+def test_failed_apoc_batch_is_rolled_back(fake_driver):
+    """A batch whose apoc.periodic.iterate inner batches failed counts no matches and
+    forgets its DOIs so a later occurrence is retried"""
+    driver = fake_driver(apoc=True, failed_batches=1)
+    loader = ultra_fast_loader.UltraFastLoader("bolt://fake", "neo4j", "pw", known_dois=set())
+    assert loader.use_apoc
+    
+    dois = ["10.1/1", "10.1/2"]
+    loader._seen.update(dois)
+    with driver.session() as session:
+        assert loader._process_batch_ultra_fast(session, list(dois), ["W1", "W2"]) == 0
+    assert not loader._seen & set(dois)
+
+
+def test_apoc_batch_counts_matches(fake_driver):
+    driver = fake_driver(apoc=True)
+    loader = ultra_fast_loader.UltraFastLoader("bolt://fake", "neo4j", "pw", known_dois=set())
+    
+    loader._seen.update(["10.1/1", "10.1/2"])
+    with driver.session() as session:
+        assert loader._process_batch_ultra_fast(session, ["10.1/1", "10.1/2"], ["W1", "W2"]) == 2
+    assert loader._seen == {"10.1/1", "10.1/2"}
+
+
+def test_doi_prefixes_are_stripped(fake_driver, tmp_path):
+    """https://doi.org/, http://doi.org/ and doi: DOIs all match the bare DOIs stored in Neo4j"""
+    fake_driver()
+    known_dois = {"10.1/a", "10.1/b", "10.1/c"}
+    loader = ultra_fast_loader.UltraFastLoader("bolt://fake", "neo4j", "pw", known_dois=known_dois)
+    
+    part_file = tmp_path / "part_000.gz"
+    part_file.write_bytes(gzip.compress(
+        b'{"id":"https://openalex.org/W1","doi":"https://doi.org/10.1/a"}\n'
+        b'{"id":"https://openalex.org/W2","doi":"http://doi.org/10.1/b"}\n'
+        b'{"id":"https://openalex.org/W3","doi":"doi:10.1/c"}\n'
+    ))
+    
+    file_stats = loader.process_file_ultra_fast(part_file)
+    assert file_stats.neo4j_matches == 3
+    assert loader._seen == known_dois